@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from typing import Protocol, runtime_checkable
 
+_START_KEY = attrgetter("start")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class CalendarEvent:
     """Unified calendar event representation."""
 
@@ -19,13 +25,22 @@ class CalendarEvent:
     description: str = ""
     location: str = ""
     all_day: bool = False
+    # ISO 8601 forms of start/end, computed once for serialization
+    start_iso: str = field(init=False, repr=False, compare=False)
+    end_iso: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "start_iso", self.start.isoformat())
+        object.__setattr__(self, "end_iso", self.end.isoformat())
 
 
 @runtime_checkable
 class CalendarBackend(Protocol):
     """Protocol that all calendar backends must satisfy."""
 
-    async def list_events(self, start: datetime, end: datetime) -> list[CalendarEvent]: ...
+    async def list_events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Return events in [start, end], sorted chronologically by start."""
+        ...
 
     async def create_event(
         self,
@@ -41,3 +56,34 @@ class CalendarBackend(Protocol):
     async def delete_event(self, event_id: str) -> bool: ...
 
     async def get_event(self, event_id: str) -> CalendarEvent: ...
+
+    async def aclose(self) -> None: ...
+
+
+async def list_all_events(
+    backends: Mapping[str, CalendarBackend], start: datetime, end: datetime
+) -> tuple[list[CalendarEvent], dict[str, Exception]]:
+    """Fetch events from several backends concurrently.
+
+    The already-sorted per-backend lists are heap-merged into one chronological
+    list. A failing backend does not affect the others; its exception is
+    returned in the second element, keyed by calendar name. Cancellation and
+    other non-Exception BaseExceptions are re-raised, not collected.
+    """
+    names = list(backends)
+    results = await asyncio.gather(
+        *(backends[name].list_events(start, end) for name in names),
+        return_exceptions=True,
+    )
+
+    sorted_lists: list[list[CalendarEvent]] = []
+    errors: dict[str, Exception] = {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            errors[name] = result
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            sorted_lists.append(result)
+
+    return list(heapq.merge(*sorted_lists, key=_START_KEY)), errors
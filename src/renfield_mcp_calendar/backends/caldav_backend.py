@@ -3,15 +3,137 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import json
 import logging
 import os
-from datetime import datetime
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from operator import attrgetter
 from typing import Any
 
+import caldav
+from icalendar import vDatetime
+
 from .base import CalendarEvent
 
 logger = logging.getLogger("renfield-mcp-calendar")
 
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "renfield")
+# Re-run discovery at least this often even if the cached URL still answers
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Properties read by the fast VEVENT scanner; everything else is skipped.
+_FAST_FIELDS = frozenset({"UID", "SUMMARY", "DESCRIPTION", "LOCATION", "DTSTART", "DTEND"})
+_TEXT_ESCAPE = re.compile(r"\\([\\;,nN])")
+# Content lines end in CRLF (bare LF tolerated); str.splitlines() would also
+# break on U+2028, \x85, \x0c etc., which may legitimately appear in values
+_LINE_BREAK = re.compile(r"\r?\n")
+_START = attrgetter("start")
+
+_VCAL_TEMPLATE = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//renfield-mcp-calendar//EN\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:{uid}\r\n"
+    "DTSTART:{dtstart}\r\n"
+    "DTEND:{dtend}\r\n"
+    "SUMMARY:{summary}\r\n"
+    "{optional}"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+def _unescape_text(value: str) -> str:
+    """Undo RFC 5545 TEXT escaping of newlines, commas, semicolons and backslashes."""
+    if "\\" not in value:
+        return value
+    return _TEXT_ESCAPE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _parse_ical_datetime(value: str) -> tuple[datetime, bool]:
+    """Parse a DATE (YYYYMMDD) or DATE-TIME (YYYYMMDDTHHMMSS[Z]) value.
+
+    Returns (naive datetime, is_date). A trailing 'Z' is dropped, matching the
+    tz-stripping of the icalendar path.
+    """
+    if len(value) == 8:
+        return datetime(int(value[:4]), int(value[4:6]), int(value[6:8])), True
+    if len(value) < 15 or value[8] != "T":
+        raise ValueError(f"Invalid iCalendar date-time: {value!r}")
+    return datetime(
+        int(value[:4]), int(value[4:6]), int(value[6:8]),
+        int(value[9:11]), int(value[11:13]), int(value[13:15]),
+    ), False
+
+
+def _scan_vevents(data: str) -> list[dict[str, tuple[str, str]]] | None:
+    """Extract the fast-path properties of each VEVENT from raw iCalendar text.
+
+    Returns one {NAME: (params, value)} dict per VEVENT, or None if the data
+    needs the full icalendar parser (DTSTART/DTEND qualified with a TZID).
+    Nested components (VALARM) are skipped.
+    """
+    # Unfold continuation lines (RFC 5545 3.1)
+    lines: list[str] = []
+    for line in _LINE_BREAK.split(data):
+        if line[:1] in (" ", "\t") and lines:
+            lines[-1] += line[1:]
+        elif line:
+            lines.append(line)
+
+    vevents: list[dict[str, tuple[str, str]]] = []
+    current: dict[str, tuple[str, str]] | None = None
+    depth = 0
+    for line in lines:
+        # Property names are case-insensitive (RFC 5545 2.)
+        if line[:6].upper() == "BEGIN:":
+            if current is not None:
+                depth += 1
+            elif line[6:].upper() == "VEVENT":
+                current = {}
+            continue
+        if line[:4].upper() == "END:":
+            if current is not None:
+                if depth:
+                    depth -= 1
+                else:
+                    vevents.append(current)
+                    current = None
+            continue
+        if current is None or depth:
+            continue
+
+        colon = line.find(":")
+        if colon == -1:
+            continue
+        head = line[:colon]
+        if '"' in head:
+            # A quoted parameter value may contain ':' — find the real separator
+            in_quotes = False
+            for i, ch in enumerate(line):
+                if ch == '"':
+                    in_quotes = not in_quotes
+                elif ch == ":" and not in_quotes:
+                    colon = i
+                    break
+            head = line[:colon]
+        name, _, params = head.partition(";")
+        name = name.upper()
+        if name not in _FAST_FIELDS:
+            continue
+        if params and name in ("DTSTART", "DTEND") and "TZID=" in params.upper():
+            return None
+        current[name] = (params, line[colon + 1:])
+    return vevents
+
 
 class CalDAVBackend:
     """Calendar backend for CalDAV servers (Nextcloud, etc.)."""
@@ -20,47 +142,137 @@ class CalDAVBackend:
         self._name = calendar_name
         self._config = config
         self._calendar = None  # Lazy init
+        self._init_lock = threading.Lock()
+        # Dedicated pool so a burst on this backend cannot starve the others
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.get("max_workers", 8),
+            thread_name_prefix=f"caldav-{calendar_name}",
+        )
 
     def _get_calendar(self):
-        """Lazy-initialize CalDAV client and calendar."""
+        """Lazy-initialize CalDAV client and calendar.
+
+        Executor threads may race here on a cold start; the lock makes sure
+        discovery runs only once.
+        """
         if self._calendar is not None:
             return self._calendar
 
-        import caldav
-
-        username = os.environ.get(self._config["username_env"], "")
-        password = os.environ.get(self._config["password_env"], "")
-        if not username or not password:
-            raise ValueError(
-                f"Calendar '{self._name}': CalDAV credentials not set "
-                f"({self._config['username_env']}, {self._config['password_env']})"
-            )
-
-        url = self._config["url"]
-        client = caldav.DAVClient(url=url, username=username, password=password)
-
-        # If URL points to a specific calendar, use it directly
-        # Otherwise, get principal and find calendar by name
-        calendar_name_filter = self._config.get("calendar_name")
-        if calendar_name_filter:
-            principal = client.principal()
-            calendars = principal.calendars()
-            for cal in calendars:
-                if cal.name == calendar_name_filter:
-                    self._calendar = cal
-                    break
-            if self._calendar is None:
-                available = [c.name for c in calendars]
+        with self._init_lock:
+            if self._calendar is not None:
+                return self._calendar
+
+            # Resolved from username_env / password_env by load_config
+            username = self._config.get("_username", "")
+            password = self._config.get("_password", "")
+            if not username or not password:
                 raise ValueError(
-                    f"Calendar '{self._name}': CalDAV calendar '{calendar_name_filter}' not found. "
-                    f"Available: {available}"
+                    f"Calendar '{self._name}': CalDAV credentials not set "
+                    f"({self._config['username_env']}, {self._config['password_env']})"
                 )
-        else:
-            # URL points directly to a calendar
-            self._calendar = caldav.Calendar(client=client, url=url)
 
-        logger.info("CalDAV connected: %s → %s", self._name, url)
-        return self._calendar
+            url = self._config["url"]
+            client = caldav.DAVClient(url=url, username=username, password=password)
+            self._tune_session(client)
+
+            # If URL points to a specific calendar, use it directly
+            # Otherwise, get principal and find calendar by name
+            calendar_name_filter = self._config.get("calendar_name")
+            if calendar_name_filter:
+                calendar = self._load_cached_calendar(client, url, calendar_name_filter)
+                if calendar is None:
+                    calendar = self._discover_calendar(client, calendar_name_filter)
+                    self._save_cached_calendar(url, calendar_name_filter, str(calendar.url))
+            else:
+                # URL points directly to a calendar
+                calendar = caldav.Calendar(client=client, url=url)
+
+            # Publish only once fully set up, for the unlocked check above
+            self._calendar = calendar
+            logger.info("CalDAV connected: %s → %s", self._name, url)
+            return self._calendar
+
+    @staticmethod
+    def _tune_session(client: Any) -> None:
+        """Mount a larger keep-alive connection pool with retries on the client's HTTP session."""
+        session = getattr(client, "session", None)
+        if session is None:
+            return
+        # Reuse the session's own adapter class (requests or niquests, depending on caldav version).
+        # Both adapters modules re-export the Retry class of the urllib3 flavour they are built on.
+        adapter_cls = type(session.get_adapter("https://"))
+        retry_cls = getattr(sys.modules.get(adapter_cls.__module__), "Retry", None)
+        adapter = adapter_cls(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=retry_cls(total=3, backoff_factor=0.2) if retry_cls else 3,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+
+    def _discover_calendar(self, client: Any, calendar_name_filter: str) -> Any:
+        """Find the calendar by name via principal discovery (several round-trips)."""
+        principal = client.principal()
+        calendars = principal.calendars()
+        for cal in calendars:
+            if cal.name == calendar_name_filter:
+                return cal
+        available = [c.name for c in calendars]
+        raise ValueError(
+            f"Calendar '{self._name}': CalDAV calendar '{calendar_name_filter}' not found. "
+            f"Available: {available}"
+        )
+
+    def _cache_file(self) -> str:
+        return os.path.join(CACHE_DIR, f"caldav_{self._name}.url")
+
+    def _load_cached_calendar(self, client: Any, url: str, calendar_name_filter: str) -> Any | None:
+        """Return the calendar at the cached URL from a previous discovery, if still valid."""
+        path = self._cache_file()
+        try:
+            with open(path, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict):
+            return None
+        if cached.get("url") != url or cached.get("calendar_name") != calendar_name_filter:
+            return None
+        calendar_url = cached.get("calendar_url")
+        saved_at = cached.get("mtime")
+        if not calendar_url or not isinstance(saved_at, (int, float)) or time.time() - saved_at > CACHE_MAX_AGE:
+            return None
+
+        # One cheap request instead of principal + calendar-home discovery
+        try:
+            valid = client.request(calendar_url, "HEAD").status < 400
+        except Exception as e:
+            logger.debug("CalDAV cache check failed for '%s': %s", self._name, e)
+            valid = False
+        if not valid:
+            logger.info("CalDAV cached calendar URL for '%s' is stale, re-discovering", self._name)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return caldav.Calendar(client=client, url=calendar_url)
+
+    def _save_cached_calendar(self, url: str, calendar_name_filter: str, calendar_url: str) -> None:
+        """Persist the discovered calendar URL so the next cold start skips discovery."""
+        path = self._cache_file()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({
+                    "url": url,
+                    "calendar_name": calendar_name_filter,
+                    "calendar_url": calendar_url,
+                    "mtime": time.time(),
+                }, f)
+        except OSError as e:
+            logger.debug("Could not write CalDAV cache for '%s': %s", self._name, e)
 
     def _parse_vevent(self, vevent: Any) -> CalendarEvent:
         """Parse a VEVENT component into a CalendarEvent."""
@@ -75,12 +287,11 @@ class CalDAVBackend:
         ev_end = dtend.dt if dtend else ev_start
 
         # Detect all-day events (date without time)
-        from datetime import date as date_type
-        all_day = isinstance(ev_start, date_type) and not isinstance(ev_start, datetime)
+        all_day = isinstance(ev_start, date) and not isinstance(ev_start, datetime)
 
         if all_day:
             ev_start = datetime(ev_start.year, ev_start.month, ev_start.day)
-            if isinstance(ev_end, date_type) and not isinstance(ev_end, datetime):
+            if isinstance(ev_end, date) and not isinstance(ev_end, datetime):
                 ev_end = datetime(ev_end.year, ev_end.month, ev_end.day)
 
         # Strip timezone info for consistent handling
@@ -102,43 +313,77 @@ class CalDAVBackend:
             all_day=all_day,
         )
 
+    def _parse_vevents_fast(self, data: str | bytes) -> list[CalendarEvent] | None:
+        """Parse VEVENTs straight from the raw iCalendar text.
+
+        Avoids building the full icalendar component tree (VTIMEZONE blocks are
+        expensive). Returns None when the data needs the icalendar path.
+        """
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        vevents = _scan_vevents(data)
+        if vevents is None:
+            return None
+
+        events = []
+        try:
+            for fields in vevents:
+                dtstart = fields.get("DTSTART")
+                dtend = fields.get("DTEND")
+                if dtstart:
+                    ev_start, all_day = _parse_ical_datetime(dtstart[1])
+                else:
+                    ev_start, all_day = datetime.now(), False
+                ev_end = _parse_ical_datetime(dtend[1])[0] if dtend else ev_start
+
+                events.append(CalendarEvent(
+                    id=fields.get("UID", ("", ""))[1],
+                    calendar=self._name,
+                    title=_unescape_text(fields.get("SUMMARY", ("", ""))[1]) or "(Kein Titel)",
+                    start=ev_start,
+                    end=ev_end,
+                    description=_unescape_text(fields.get("DESCRIPTION", ("", ""))[1]),
+                    location=_unescape_text(fields.get("LOCATION", ("", ""))[1]),
+                    all_day=all_day,
+                ))
+        except ValueError:
+            return None
+        return events
+
     def _list_events_sync(self, start: datetime, end: datetime) -> list[CalendarEvent]:
         cal = self._get_calendar()
         results = cal.date_search(start=start, end=end, expand=True)
 
         events = []
         for event_obj in results:
-            vevents = event_obj.icalendar_instance.walk("VEVENT")
-            for vevent in vevents:
-                events.append(self._parse_vevent(vevent))
-
-        # Sort chronologically
-        events.sort(key=lambda e: e.start)
+            parsed = self._parse_vevents_fast(event_obj.data)
+            if parsed is None:
+                parsed = [self._parse_vevent(v) for v in event_obj.icalendar_instance.walk("VEVENT")]
+            events.extend(parsed)
+
+        # Sort chronologically. Unlike EWS (order_by) and Google (orderBy),
+        # CalDAV REPORT results come back in server order.
+        events.sort(key=_START)
         return events
 
     def _create_event_sync(
         self, title: str, start: datetime, end: datetime, description: str, location: str
     ) -> CalendarEvent:
-        import uuid
-
         cal = self._get_calendar()
         uid = str(uuid.uuid4())
 
-        vcal = (
-            "BEGIN:VCALENDAR\r\n"
-            "VERSION:2.0\r\n"
-            "PRODID:-//renfield-mcp-calendar//EN\r\n"
-            "BEGIN:VEVENT\r\n"
-            f"UID:{uid}\r\n"
-            f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}\r\n"
-            f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}\r\n"
-            f"SUMMARY:{title}\r\n"
-        )
+        optional = ""
         if description:
-            vcal += f"DESCRIPTION:{description}\r\n"
+            optional += f"DESCRIPTION:{description}\r\n"
         if location:
-            vcal += f"LOCATION:{location}\r\n"
-        vcal += "END:VEVENT\r\nEND:VCALENDAR\r\n"
+            optional += f"LOCATION:{location}\r\n"
+        vcal = _VCAL_TEMPLATE.format(
+            uid=uid,
+            dtstart=start.strftime("%Y%m%dT%H%M%S"),
+            dtend=end.strftime("%Y%m%dT%H%M%S"),
+            summary=title,
+            optional=optional,
+        )
 
         cal.save_event(vcal)
         logger.info("CalDAV event created: %s in '%s'", title, self._name)
@@ -164,10 +409,8 @@ class CalDAVBackend:
         if "title" in kwargs:
             vevent["summary"] = kwargs["title"]
         if "start" in kwargs:
-            from icalendar import vDatetime
             vevent["dtstart"] = vDatetime(kwargs["start"])
         if "end" in kwargs:
-            from icalendar import vDatetime
             vevent["dtend"] = vDatetime(kwargs["end"])
         if "description" in kwargs:
             vevent["description"] = kwargs["description"]
@@ -196,22 +439,30 @@ class CalDAVBackend:
 
     async def list_events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._list_events_sync, start, end)
+        return await loop.run_in_executor(self._executor, self._list_events_sync, start, end)
 
     async def create_event(
         self, title: str, start: datetime, end: datetime, description: str = "", location: str = ""
     ) -> CalendarEvent:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._create_event_sync, title, start, end, description, location)
+        return await loop.run_in_executor(
+            self._executor, self._create_event_sync, title, start, end, description, location
+        )
 
     async def update_event(self, event_id: str, **kwargs: object) -> CalendarEvent:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: self._update_event_sync(event_id, **kwargs))
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._update_event_sync, event_id, **kwargs)
+        )
 
     async def delete_event(self, event_id: str) -> bool:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._delete_event_sync, event_id)
+        return await loop.run_in_executor(self._executor, self._delete_event_sync, event_id)
 
     async def get_event(self, event_id: str) -> CalendarEvent:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._get_event_sync, event_id)
+        return await loop.run_in_executor(self._executor, self._get_event_sync, event_id)
+
+    async def aclose(self) -> None:
+        """Release the backend's worker threads."""
+        self._executor.shutdown(wait=False)
@@ -3,16 +3,31 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
-from .base import CalendarBackend, CalendarEvent
+from exchangelib import DELEGATE, Account, Configuration, Credentials, EWSDateTime, EWSTimeZone
+from exchangelib import CalendarItem as EWSCalendarItem
+from exchangelib.errors import DoesNotExist, ErrorItemNotFound
+
+from .base import CalendarEvent
 
 logger = logging.getLogger("renfield-mcp-calendar")
 
 
+def _to_local_naive(dt: datetime) -> datetime:
+    """Convert an aware datetime to naive local time.
+
+    Goes through the POSIX timestamp: much cheaper than EWSDateTime.astimezone()
+    followed by replace(tzinfo=None), with the same result.
+    """
+    return datetime.fromtimestamp(dt.timestamp())
+
+
 class EWSBackend:
     """Calendar backend for Microsoft Exchange via EWS."""
 
@@ -20,46 +35,64 @@ class EWSBackend:
         self._name = calendar_name
         self._config = config
         self._account = None  # Lazy init
+        self._tz = None  # Local EWSTimeZone, resolved once in _get_account
+        self._init_lock = threading.Lock()
+        # Dedicated pool so a burst on this backend cannot starve the others
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.get("max_workers", 8),
+            thread_name_prefix=f"ews-{calendar_name}",
+        )
 
     def _get_account(self):
-        """Lazy-initialize exchangelib Account."""
+        """Lazy-initialize exchangelib Account.
+
+        Executor threads may race here on a cold start; the lock makes sure
+        the account is built only once.
+        """
         if self._account is not None:
             return self._account
 
-        from exchangelib import Account, Configuration, Credentials, DELEGATE
-
-        username = os.environ.get(self._config["username_env"], "")
-        password = os.environ.get(self._config["password_env"], "")
-        if not username or not password:
-            raise ValueError(
-                f"Calendar '{self._name}': EWS credentials not set "
-                f"({self._config['username_env']}, {self._config['password_env']})"
+        with self._init_lock:
+            if self._account is not None:
+                return self._account
+
+            # Resolved from username_env / password_env by load_config
+            username = self._config.get("_username", "")
+            password = self._config.get("_password", "")
+            if not username or not password:
+                raise ValueError(
+                    f"Calendar '{self._name}': EWS credentials not set "
+                    f"({self._config['username_env']}, {self._config['password_env']})"
+                )
+
+            ews_url = self._config["ews_url"]
+            credentials = Credentials(username=username, password=password)
+            ews_config = Configuration(
+                server=ews_url.split("//")[1].split("/")[0],  # Extract hostname
+                credentials=credentials,
+                service_endpoint=ews_url,
             )
 
-        ews_url = self._config["ews_url"]
-        credentials = Credentials(username=username, password=password)
-        ews_config = Configuration(
-            server=ews_url.split("//")[1].split("/")[0],  # Extract hostname
-            credentials=credentials,
-            service_endpoint=ews_url,
-        )
+            account = Account(
+                primary_smtp_address=self._config.get("email", username),
+                config=ews_config,
+                autodiscover=False,
+                access_type=DELEGATE,
+            )
+            # _tz must be set before _account is published to the unlocked check
+            self._tz = EWSTimeZone.localzone()
+            self._account = account
+            logger.info("EWS connected: %s → %s", self._name, ews_url)
+            return self._account
 
-        self._account = Account(
-            primary_smtp_address=self._config.get("email", username),
-            config=ews_config,
-            autodiscover=False,
-            access_type=DELEGATE,
-        )
-        logger.info("EWS connected: %s → %s", self._name, ews_url)
-        return self._account
+    def _to_ews_datetime(self, dt: datetime) -> EWSDateTime:
+        """Convert to an EWSDateTime in the cached local zone (requires _get_account first)."""
+        return EWSDateTime.from_datetime(dt.astimezone(self._tz))
 
     def _list_events_sync(self, start: datetime, end: datetime) -> list[CalendarEvent]:
-        from exchangelib import EWSDateTime, EWSTimeZone
-
         account = self._get_account()
-        tz = EWSTimeZone.localzone()
-        ews_start = EWSDateTime.from_datetime(start.astimezone(tz))
-        ews_end = EWSDateTime.from_datetime(end.astimezone(tz))
+        ews_start = self._to_ews_datetime(start)
+        ews_end = self._to_ews_datetime(end)
 
         items = account.calendar.filter(start__lt=ews_end, end__gt=ews_start).order_by("start")
 
@@ -69,8 +102,8 @@ class EWSBackend:
                 id=item.id,
                 calendar=self._name,
                 title=item.subject or "(Kein Titel)",
-                start=item.start.astimezone().replace(tzinfo=None) if item.start else start,
-                end=item.end.astimezone().replace(tzinfo=None) if item.end else end,
+                start=_to_local_naive(item.start) if item.start else start,
+                end=_to_local_naive(item.end) if item.end else end,
                 description=item.body or "" if hasattr(item, "body") else "",
                 location=item.location or "" if hasattr(item, "location") else "",
                 all_day=item.is_all_day if hasattr(item, "is_all_day") else False,
@@ -80,17 +113,14 @@ class EWSBackend:
     def _create_event_sync(
         self, title: str, start: datetime, end: datetime, description: str, location: str
     ) -> CalendarEvent:
-        from exchangelib import CalendarItem as EWSCalendarItem, EWSDateTime, EWSTimeZone
-
         account = self._get_account()
-        tz = EWSTimeZone.localzone()
 
         item = EWSCalendarItem(
             account=account,
             folder=account.calendar,
             subject=title,
-            start=EWSDateTime.from_datetime(start.astimezone(tz)),
-            end=EWSDateTime.from_datetime(end.astimezone(tz)),
+            start=self._to_ews_datetime(start),
+            end=self._to_ews_datetime(end),
             body=description,
             location=location,
         )
@@ -107,59 +137,66 @@ class EWSBackend:
             location=location,
         )
 
-    def _update_event_sync(self, event_id: str, **kwargs: object) -> CalendarEvent:
+    def _fetch_item(self, event_id: str) -> EWSCalendarItem | None:
+        """Fetch a single item by ID with one GetItem call (no FindItem search)."""
         account = self._get_account()
-        items = list(account.calendar.filter(id=event_id))
-        if not items:
+        try:
+            return account.calendar.get(id=event_id)
+        except (DoesNotExist, ErrorItemNotFound):
+            return None
+
+    def _update_event_sync(self, event_id: str, **kwargs: object) -> CalendarEvent:
+        item = self._fetch_item(event_id)
+        if item is None:
             raise ValueError(f"Event not found: {event_id}")
 
-        item = items[0]
+        # Only the touched fields are serialized into the UpdateItem request
+        updated: list[str] = []
         if "title" in kwargs:
             item.subject = kwargs["title"]
+            updated.append("subject")
         if "start" in kwargs:
-            from exchangelib import EWSDateTime, EWSTimeZone
-            tz = EWSTimeZone.localzone()
-            item.start = EWSDateTime.from_datetime(kwargs["start"].astimezone(tz))
+            item.start = self._to_ews_datetime(kwargs["start"])
+            updated.append("start")
         if "end" in kwargs:
-            from exchangelib import EWSDateTime, EWSTimeZone
-            tz = EWSTimeZone.localzone()
-            item.end = EWSDateTime.from_datetime(kwargs["end"].astimezone(tz))
+            item.end = self._to_ews_datetime(kwargs["end"])
+            updated.append("end")
         if "description" in kwargs:
             item.body = kwargs["description"]
+            updated.append("body")
         if "location" in kwargs:
             item.location = kwargs["location"]
-        item.save()
+            updated.append("location")
+        if updated:
+            item.save(update_fields=updated)
 
         return CalendarEvent(
             id=item.id,
             calendar=self._name,
             title=item.subject or "",
-            start=item.start.astimezone().replace(tzinfo=None) if item.start else datetime.now(),
-            end=item.end.astimezone().replace(tzinfo=None) if item.end else datetime.now(),
+            start=_to_local_naive(item.start) if item.start else datetime.now(),
+            end=_to_local_naive(item.end) if item.end else datetime.now(),
             description=str(item.body) if item.body else "",
             location=item.location or "",
         )
 
     def _delete_event_sync(self, event_id: str) -> bool:
-        account = self._get_account()
-        items = list(account.calendar.filter(id=event_id))
-        if not items:
+        item = self._fetch_item(event_id)
+        if item is None:
             return False
-        items[0].delete()
+        item.delete()
         return True
 
     def _get_event_sync(self, event_id: str) -> CalendarEvent:
-        account = self._get_account()
-        items = list(account.calendar.filter(id=event_id))
-        if not items:
+        item = self._fetch_item(event_id)
+        if item is None:
             raise ValueError(f"Event not found: {event_id}")
-        item = items[0]
         return CalendarEvent(
             id=item.id,
             calendar=self._name,
             title=item.subject or "",
-            start=item.start.astimezone().replace(tzinfo=None) if item.start else datetime.now(),
-            end=item.end.astimezone().replace(tzinfo=None) if item.end else datetime.now(),
+            start=_to_local_naive(item.start) if item.start else datetime.now(),
+            end=_to_local_naive(item.end) if item.end else datetime.now(),
             description=str(item.body) if item.body else "",
             location=item.location or "",
             all_day=item.is_all_day if hasattr(item, "is_all_day") else False,
@@ -167,22 +204,30 @@ class EWSBackend:
 
     async def list_events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._list_events_sync, start, end)
+        return await loop.run_in_executor(self._executor, self._list_events_sync, start, end)
 
     async def create_event(
         self, title: str, start: datetime, end: datetime, description: str = "", location: str = ""
     ) -> CalendarEvent:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._create_event_sync, title, start, end, description, location)
+        return await loop.run_in_executor(
+            self._executor, self._create_event_sync, title, start, end, description, location
+        )
 
     async def update_event(self, event_id: str, **kwargs: object) -> CalendarEvent:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: self._update_event_sync(event_id, **kwargs))
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._update_event_sync, event_id, **kwargs)
+        )
 
     async def delete_event(self, event_id: str) -> bool:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._delete_event_sync, event_id)
+        return await loop.run_in_executor(self._executor, self._delete_event_sync, event_id)
 
     async def get_event(self, event_id: str) -> CalendarEvent:
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._get_event_sync, event_id)
+        return await loop.run_in_executor(self._executor, self._get_event_sync, event_id)
+
+    async def aclose(self) -> None:
+        """Release the backend's worker threads."""
+        self._executor.shutdown(wait=False)
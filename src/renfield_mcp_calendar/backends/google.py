@@ -1,4 +1,4 @@
-"""Google Calendar API backend."""
+"""Google Calendar API backend (REST via aiohttp)."""
 
 from __future__ import annotations
 
@@ -6,118 +6,182 @@ import asyncio
 import json
 import logging
 import os
+import threading
 from datetime import datetime
 from typing import Any
+from urllib.parse import quote
+
+import aiohttp
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 
 from .base import CalendarEvent
 
 logger = logging.getLogger("renfield-mcp-calendar")
 
+API_BASE = "https://www.googleapis.com/calendar/v3"
+SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+# Only request the fields CalendarEvent uses (drops attendees, conferencing, ...)
+LIST_FIELDS = "items(id,summary,start,end,description,location),nextPageToken"
+PAGE_SIZE = 250
+MAX_PAGES = 10
+
 
 class GoogleCalendarBackend:
-    """Calendar backend for Google Calendar via Google API."""
+    """Calendar backend for Google Calendar via the REST API."""
 
     def __init__(self, calendar_name: str, config: dict[str, Any]):
         self._name = calendar_name
         self._config = config
-        self._service = None  # Lazy init
         self._calendar_id = config.get("calendar_id", "primary")
+        self._events_url = f"{API_BASE}/calendars/{quote(self._calendar_id, safe='')}/events"
+        self._creds = None  # Lazy init
+        self._init_lock = threading.Lock()
+        self._session: aiohttp.ClientSession | None = None  # Lazy init
+
+    def _refresh_credentials_sync(self, rejected_token: str | None = None) -> None:
+        """Load the OAuth2 token on first use and refresh it when expired.
+
+        ``rejected_token`` forces a refresh of a token the API answered with
+        401 (revoked, or expired before its local expiry). Concurrent callers
+        are serialized so only one refresh hits the token endpoint.
+        """
+        with self._init_lock:
+            creds = self._creds
+            stale = creds is not None and rejected_token is not None and creds.token == rejected_token
+            if creds is not None and creds.valid and not stale:
+                return
+
+            token_file = self._config.get("token_file", "/data/google_calendar_token.json")
+            credentials_file = self._config["credentials_file"]
+
+            # Load existing token
+            if creds is None and os.path.isfile(token_file):
+                with open(token_file, "r") as f:
+                    token_data = json.load(f)
+                creds = Credentials.from_authorized_user_info(token_data, SCOPES)
+
+            # Refresh or obtain new credentials
+            if not creds or not creds.valid or stale:
+                if creds and creds.refresh_token and (creds.expired or stale):
+                    creds.refresh(Request())
+                    # Persist refreshed token
+                    with open(token_file, "w") as f:
+                        json.dump(json.loads(creds.to_json()), f)
+                    logger.info("Google token refreshed for '%s'", self._name)
+                elif os.path.isfile(credentials_file):
+                    raise ValueError(
+                        f"Calendar '{self._name}': Google token not found or expired. "
+                        f"Run: python -m renfield_mcp_calendar --auth google --calendar {self._name}"
+                    )
+                else:
+                    raise ValueError(
+                        f"Calendar '{self._name}': credentials file not found: {credentials_file}"
+                    )
+
+            if self._creds is None:
+                logger.info("Google Calendar connected: %s (calendar_id=%s)", self._name, self._calendar_id)
+            self._creds = creds
+
+    async def _get_token(self, rejected_token: str | None = None) -> str:
+        """Return a valid access token, refreshing it off the event loop only when needed."""
+        if rejected_token is not None or self._creds is None or not self._creds.valid:
+            await asyncio.to_thread(self._refresh_credentials_sync, rejected_token)
+        return self._creds.token
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazy-initialize the shared HTTP session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+                raise_for_status=True,
+            )
+        return self._session
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> dict[str, Any]:
+        """Issue an authorized API request and return the decoded JSON body.
+
+        A 401 refreshes the token and retries once.
+        """
+        token = await self._get_token()
+        try:
+            return await self._send(method, url, token, **kwargs)
+        except aiohttp.ClientResponseError as e:
+            if e.status != 401:
+                raise
+            logger.info("Google token rejected for '%s', refreshing", self._name)
+        token = await self._get_token(rejected_token=token)
+        return await self._send(method, url, token, **kwargs)
+
+    async def _send(self, method: str, url: str, token: str, **kwargs: Any) -> dict[str, Any]:
+        headers = {"Authorization": f"Bearer {token}"}
+        async with self._get_session().request(method, url, headers=headers, **kwargs) as resp:
+            if resp.status == 204:
+                return {}
+            return await resp.json()
+
+    def _event_url(self, event_id: str) -> str:
+        return f"{self._events_url}/{quote(event_id, safe='')}"
+
+    def _parse_item(self, item: dict[str, Any], default_title: str = "") -> CalendarEvent:
+        """Convert a Google API event resource into a CalendarEvent."""
+        start_raw = item.get("start", {})
+        end_raw = item.get("end", {})
+
+        # All-day events use 'date', timed events use 'dateTime' (RFC 3339,
+        # which fromisoformat handles natively, including a trailing 'Z')
+        all_day = "date" in start_raw and "dateTime" not in start_raw
+
+        if all_day:
+            ev_start = datetime.fromisoformat(start_raw["date"])
+            ev_end = datetime.fromisoformat(end_raw.get("date", start_raw["date"]))
+        else:
+            ev_start = datetime.fromisoformat(start_raw.get("dateTime", ""))
+            ev_end = datetime.fromisoformat(end_raw.get("dateTime", ""))
 
-    def _get_service(self):
-        """Lazy-initialize Google Calendar API service with auto-refresh."""
-        if self._service is not None:
-            return self._service
-
-        from google.auth.transport.requests import Request
-        from google.oauth2.credentials import Credentials
-        from google_auth_oauthlib.flow import InstalledAppFlow
-        from googleapiclient.discovery import build
-
-        SCOPES = ["https://www.googleapis.com/auth/calendar"]
-
-        creds = None
-        token_file = self._config.get("token_file", "/data/google_calendar_token.json")
-        credentials_file = self._config["credentials_file"]
-
-        # Load existing token
-        if os.path.isfile(token_file):
-            with open(token_file, "r") as f:
-                token_data = json.load(f)
-            creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-
-        # Refresh or obtain new credentials
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-                # Persist refreshed token
-                with open(token_file, "w") as f:
-                    json.dump(json.loads(creds.to_json()), f)
-                logger.info("Google token refreshed for '%s'", self._name)
-            elif os.path.isfile(credentials_file):
-                raise ValueError(
-                    f"Calendar '{self._name}': Google token not found or expired. "
-                    f"Run: python -m renfield_mcp_calendar --auth google --calendar {self._name}"
-                )
-            else:
-                raise ValueError(
-                    f"Calendar '{self._name}': credentials file not found: {credentials_file}"
-                )
-
-        self._service = build("calendar", "v3", credentials=creds)
-        logger.info("Google Calendar connected: %s (calendar_id=%s)", self._name, self._calendar_id)
-        return self._service
-
-    def _list_events_sync(self, start: datetime, end: datetime) -> list[CalendarEvent]:
-        service = self._get_service()
+        return CalendarEvent(
+            id=item["id"],
+            calendar=self._name,
+            title=item.get("summary", default_title),
+            start=ev_start.replace(tzinfo=None) if ev_start.tzinfo else ev_start,
+            end=ev_end.replace(tzinfo=None) if ev_end.tzinfo else ev_end,
+            description=item.get("description", ""),
+            location=item.get("location", ""),
+            all_day=all_day,
+        )
+
+    async def list_events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
         time_min = start.isoformat() + "Z" if not start.tzinfo else start.isoformat()
         time_max = end.isoformat() + "Z" if not end.tzinfo else end.isoformat()
 
-        events_result = (
-            service.events()
-            .list(
-                calendarId=self._calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy="startTime",
-                maxResults=250,
-            )
-            .execute()
-        )
+        params: dict[str, Any] = {
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "singleEvents": "true",
+            "orderBy": "startTime",
+            "maxResults": PAGE_SIZE,
+            "fields": LIST_FIELDS,
+        }
 
-        events = []
-        for item in events_result.get("items", []):
-            start_raw = item.get("start", {})
-            end_raw = item.get("end", {})
-
-            # All-day events use 'date', timed events use 'dateTime'
-            all_day = "date" in start_raw and "dateTime" not in start_raw
-
-            if all_day:
-                from dateutil.parser import parse as parse_dt
-                ev_start = parse_dt(start_raw["date"])
-                ev_end = parse_dt(end_raw.get("date", start_raw["date"]))
-            else:
-                from dateutil.parser import parse as parse_dt
-                ev_start = parse_dt(start_raw.get("dateTime", ""))
-                ev_end = parse_dt(end_raw.get("dateTime", ""))
-
-            events.append(CalendarEvent(
-                id=item["id"],
-                calendar=self._name,
-                title=item.get("summary", "(Kein Titel)"),
-                start=ev_start.replace(tzinfo=None) if ev_start.tzinfo else ev_start,
-                end=ev_end.replace(tzinfo=None) if ev_end.tzinfo else ev_end,
-                description=item.get("description", ""),
-                location=item.get("location", ""),
-                all_day=all_day,
-            ))
+        events: list[CalendarEvent] = []
+        for _ in range(MAX_PAGES):
+            page = await self._request("GET", self._events_url, params=params)
+            events.extend(self._parse_item(item, "(Kein Titel)") for item in page.get("items", []))
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                break
+            params["pageToken"] = page_token
+        else:
+            logger.warning(
+                "Google Calendar '%s': more than %d events in range, result truncated",
+                self._name, MAX_PAGES * PAGE_SIZE,
+            )
         return events
 
-    def _create_event_sync(
-        self, title: str, start: datetime, end: datetime, description: str, location: str
+    async def create_event(
+        self, title: str, start: datetime, end: datetime, description: str = "", location: str = ""
     ) -> CalendarEvent:
-        service = self._get_service()
         body: dict[str, Any] = {
             "summary": title,
             "start": {"dateTime": start.isoformat(), "timeZone": "Europe/Berlin"},
@@ -128,7 +192,7 @@ class GoogleCalendarBackend:
         if location:
             body["location"] = location
 
-        result = service.events().insert(calendarId=self._calendar_id, body=body).execute()
+        result = await self._request("POST", self._events_url, json=body)
         logger.info("Google event created: %s in '%s'", title, self._name)
 
         return CalendarEvent(
@@ -141,87 +205,32 @@ class GoogleCalendarBackend:
             location=location,
         )
 
-    def _update_event_sync(self, event_id: str, **kwargs: object) -> CalendarEvent:
-        service = self._get_service()
-        event = service.events().get(calendarId=self._calendar_id, eventId=event_id).execute()
-
+    async def update_event(self, event_id: str, **kwargs: object) -> CalendarEvent:
+        # PATCH sends only the changed fields, so no prior GET is needed
+        body: dict[str, Any] = {}
         if "title" in kwargs:
-            event["summary"] = kwargs["title"]
+            body["summary"] = kwargs["title"]
         if "start" in kwargs:
-            event["start"] = {"dateTime": kwargs["start"].isoformat(), "timeZone": "Europe/Berlin"}
+            body["start"] = {"dateTime": kwargs["start"].isoformat(), "timeZone": "Europe/Berlin"}
         if "end" in kwargs:
-            event["end"] = {"dateTime": kwargs["end"].isoformat(), "timeZone": "Europe/Berlin"}
+            body["end"] = {"dateTime": kwargs["end"].isoformat(), "timeZone": "Europe/Berlin"}
         if "description" in kwargs:
-            event["description"] = kwargs["description"]
+            body["description"] = kwargs["description"]
         if "location" in kwargs:
-            event["location"] = kwargs["location"]
+            body["location"] = kwargs["location"]
 
-        result = service.events().update(calendarId=self._calendar_id, eventId=event_id, body=event).execute()
-
-        from dateutil.parser import parse as parse_dt
-        ev_start = parse_dt(result["start"].get("dateTime", result["start"].get("date", "")))
-        ev_end = parse_dt(result["end"].get("dateTime", result["end"].get("date", "")))
-
-        return CalendarEvent(
-            id=result["id"],
-            calendar=self._name,
-            title=result.get("summary", ""),
-            start=ev_start.replace(tzinfo=None) if ev_start.tzinfo else ev_start,
-            end=ev_end.replace(tzinfo=None) if ev_end.tzinfo else ev_end,
-            description=result.get("description", ""),
-            location=result.get("location", ""),
-        )
-
-    def _delete_event_sync(self, event_id: str) -> bool:
-        service = self._get_service()
-        service.events().delete(calendarId=self._calendar_id, eventId=event_id).execute()
-        return True
-
-    def _get_event_sync(self, event_id: str) -> CalendarEvent:
-        service = self._get_service()
-        item = service.events().get(calendarId=self._calendar_id, eventId=event_id).execute()
-
-        start_raw = item.get("start", {})
-        end_raw = item.get("end", {})
-        all_day = "date" in start_raw and "dateTime" not in start_raw
-
-        from dateutil.parser import parse as parse_dt
-        if all_day:
-            ev_start = parse_dt(start_raw["date"])
-            ev_end = parse_dt(end_raw.get("date", start_raw["date"]))
-        else:
-            ev_start = parse_dt(start_raw.get("dateTime", ""))
-            ev_end = parse_dt(end_raw.get("dateTime", ""))
-
-        return CalendarEvent(
-            id=item["id"],
-            calendar=self._name,
-            title=item.get("summary", ""),
-            start=ev_start.replace(tzinfo=None) if ev_start.tzinfo else ev_start,
-            end=ev_end.replace(tzinfo=None) if ev_end.tzinfo else ev_end,
-            description=item.get("description", ""),
-            location=item.get("location", ""),
-            all_day=all_day,
-        )
-
-    async def list_events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._list_events_sync, start, end)
-
-    async def create_event(
-        self, title: str, start: datetime, end: datetime, description: str = "", location: str = ""
-    ) -> CalendarEvent:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._create_event_sync, title, start, end, description, location)
-
-    async def update_event(self, event_id: str, **kwargs: object) -> CalendarEvent:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: self._update_event_sync(event_id, **kwargs))
+        result = await self._request("PATCH", self._event_url(event_id), json=body)
+        return self._parse_item(result)
 
     async def delete_event(self, event_id: str) -> bool:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._delete_event_sync, event_id)
+        await self._request("DELETE", self._event_url(event_id))
+        return True
 
     async def get_event(self, event_id: str) -> CalendarEvent:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._get_event_sync, event_id)
+        item = await self._request("GET", self._event_url(event_id))
+        return self._parse_item(item)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
@@ -4,62 +4,108 @@ from __future__ import annotations
 
 import logging
 import os
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
 logger = logging.getLogger("renfield-mcp-calendar")
 
 CONFIG_PATH = os.environ.get("CALENDAR_CONFIG", "/config/calendar_accounts.yaml")
 
-VALID_TYPES = {"ews", "google", "caldav"}
-VALID_VISIBILITIES = {"shared", "owner"}
+VALID_TYPES: frozenset[str] = frozenset({"ews", "google", "caldav"})
+VALID_VISIBILITIES: frozenset[str] = frozenset({"shared", "owner"})
+
+# Top-level entry keys that are CalendarAccount fields, not backend config
+_METADATA_KEYS = frozenset({"name", "label", "type", "visibility", "owner_id"})
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CalendarAccount:
     """A single calendar account configuration."""
 
     name: str
     label: str
     type: str  # ews, google, caldav
-    config: dict[str, Any] = field(default_factory=dict)
+    config: Mapping[str, Any] = field(default_factory=dict)
     visibility: str = "shared"  # "shared" | "owner"
     owner_id: int | None = None  # matches _user_id from Renfield
+    # Resolved from the *_env fields; kept out of repr so secrets never reach logs
+    credentials: Mapping[str, str] = field(default_factory=dict, repr=False)
+
+
+# Required backend config fields per type; keys must match VALID_TYPES
+_REQUIRED_FIELDS: dict[str, tuple[str, ...]] = {
+    "ews": ("ews_url", "username_env", "password_env"),
+    "google": ("credentials_file",),
+    "caldav": ("url", "username_env", "password_env"),
+}
+
+# Fields naming env vars to resolve at load time: 'username_env' -> credentials['_username']
+_ENV_FIELDS: dict[str, tuple[str, ...]] = {
+    "ews": ("username_env", "password_env"),
+    "caldav": ("username_env", "password_env"),
+}
 
 
 def load_config() -> dict[str, CalendarAccount]:
     """Load and validate calendar_accounts.yaml.
 
-    Returns dict of name -> CalendarAccount.
+    Returns dict of name -> CalendarAccount. The file is read on every call,
+    so credential env vars always reflect the current environment.
     """
     path = CONFIG_PATH
     if not os.path.isfile(path):
         logger.warning("Config file not found: %s", path)
         return {}
 
-    with open(path, "r") as f:
-        raw = yaml.safe_load(f)
+    # libyaml decodes bytes itself, so skip the text-mode decoding layer
+    with open(path, "rb") as f:
+        return load_config_from_text(f.read())
+
 
-    if not raw or "calendars" not in raw:
+def load_config_from_text(text: str | bytes) -> dict[str, CalendarAccount]:
+    """Parse and validate calendar_accounts.yaml content.
+
+    Credential env vars are resolved against the current environment; the
+    per-account config and credentials mappings are read-only. Malformed YAML is reported
+    as ValueError, like every other config error.
+    """
+    try:
+        raw = yaml.load(text, Loader=_Loader)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Config is not valid YAML: {e}") from e
+
+    calendars = raw.get("calendars") if isinstance(raw, dict) else None
+    if not calendars:
         logger.warning("No 'calendars' key in config file")
         return {}
 
+    env = os.environ
     accounts: dict[str, CalendarAccount] = {}
-    seen_names: set[str] = set()
 
-    for entry in raw["calendars"]:
-        name = entry.get("name", "").strip()
+    for entry in calendars:
+        # Interned: names are the keys of every account/backend lookup
+        name = sys.intern(entry.get("name", "").strip())
         if not name:
             raise ValueError("Calendar missing 'name' field")
-        if name in seen_names:
+        if name in accounts:
             raise ValueError(f"Duplicate calendar name: '{name}'")
-        seen_names.add(name)
 
         cal_type = entry.get("type", "").strip().lower()
         if cal_type not in VALID_TYPES:
-            raise ValueError(f"Calendar '{name}': unknown type '{cal_type}'. Must be one of: {VALID_TYPES}")
+            raise ValueError(
+                f"Calendar '{name}': unknown type '{cal_type}'. "
+                f"Must be one of: {', '.join(sorted(VALID_TYPES))}"
+            )
 
         label = entry.get("label", name)
 
@@ -68,7 +114,7 @@ def load_config() -> dict[str, CalendarAccount]:
         if visibility not in VALID_VISIBILITIES:
             raise ValueError(
                 f"Calendar '{name}': invalid visibility '{visibility}'. "
-                f"Must be one of: {VALID_VISIBILITIES}"
+                f"Must be one of: {', '.join(sorted(VALID_VISIBILITIES))}"
             )
         raw_owner = entry.get("owner_id")
         owner_id = int(raw_owner) if raw_owner is not None else None
@@ -77,41 +123,29 @@ def load_config() -> dict[str, CalendarAccount]:
                 f"Calendar '{name}': visibility 'owner' requires 'owner_id'"
             )
 
-        # Collect type-specific config (everything except metadata fields)
-        config = {
-            k: v for k, v in entry.items()
-            if k not in ("name", "label", "type", "visibility", "owner_id")
-        }
+        # Collect type-specific config (everything except metadata fields).
+        # The parsed entry is not used afterwards, so strip it in place.
+        for meta_key in _METADATA_KEYS:
+            entry.pop(meta_key, None)
+        config = entry
 
         # Validate required fields per type
-        if cal_type == "ews":
-            if "ews_url" not in config:
-                raise ValueError(f"Calendar '{name}' (ews): 'ews_url' is required")
-            if "username_env" not in config or "password_env" not in config:
-                raise ValueError(f"Calendar '{name}' (ews): 'username_env' and 'password_env' are required")
-            # Warn if env vars not set
-            for env_key in ("username_env", "password_env"):
-                env_var = config[env_key]
-                if not os.environ.get(env_var):
-                    logger.warning("Calendar '%s': env var '%s' not set", name, env_var)
-
-        elif cal_type == "google":
-            if "credentials_file" not in config:
-                raise ValueError(f"Calendar '{name}' (google): 'credentials_file' is required")
-
-        elif cal_type == "caldav":
-            if "url" not in config:
-                raise ValueError(f"Calendar '{name}' (caldav): 'url' is required")
-            if "username_env" not in config or "password_env" not in config:
-                raise ValueError(f"Calendar '{name}' (caldav): 'username_env' and 'password_env' are required")
-            for env_key in ("username_env", "password_env"):
-                env_var = config[env_key]
-                if not os.environ.get(env_var):
-                    logger.warning("Calendar '%s': env var '%s' not set", name, env_var)
+        for required in _REQUIRED_FIELDS[cal_type]:
+            if required not in config:
+                raise ValueError(f"Calendar '{name}' ({cal_type}): '{required}' is required")
+
+        # Resolve credentials once, separately from config so they stay out of repr
+        credentials: dict[str, str] = {}
+        for env_key in _ENV_FIELDS.get(cal_type, ()):
+            env_var = config[env_key]
+            value = env.get(env_var, "")
+            if not value:
+                logger.warning("Calendar '%s': env var '%s' not set", name, env_var)
+            credentials["_" + env_key.removesuffix("_env")] = value
 
         accounts[name] = CalendarAccount(
-            name=name, label=label, type=cal_type, config=config,
-            visibility=visibility, owner_id=owner_id,
+            name=name, label=label, type=cal_type, config=MappingProxyType(config),
+            visibility=visibility, owner_id=owner_id, credentials=MappingProxyType(credentials),
         )
 
     return accounts
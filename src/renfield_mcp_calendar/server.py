@@ -6,18 +6,25 @@ Multi-calendar support via YAML config. Backends: Exchange EWS, Google Calendar,
 
 Environment variables:
     CALENDAR_CONFIG — Path to calendar_accounts.yaml (default: /config/calendar_accounts.yaml)
+    CALENDAR_EAGER_LOAD — If set, create backends at startup instead of on first use
 """
 
+import argparse
 import asyncio
 import logging
+import os
 import sys
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
 from dataclasses import asdict
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import Any
 
+from dateutil.parser import parse as parse_dt
 from mcp.server.fastmcp import FastMCP
 
-from .backends.base import CalendarBackend, CalendarEvent
+from .backends.base import CalendarBackend, CalendarEvent, list_all_events
 from .config import CalendarAccount, load_config
 
 # MCP stdio servers must NEVER write to stdout — log to stderr only.
@@ -33,51 +40,128 @@ logger = logging.getLogger("renfield-mcp-calendar")
 # Module-level state
 # ---------------------------------------------------------------------------
 
-_accounts: dict[str, CalendarAccount] = {}
+_accounts: dict[str, CalendarAccount] | None = None  # Loaded on first tool call
+_account_names: tuple[str, ...] = ()  # Config order
+_shared_names: tuple[str, ...] = ()  # Visible to every user
+_visible_by_owner: dict[int, tuple[str, ...]] = {}  # owner_id -> shared + owned, config order
+_shared_set: frozenset[str] = frozenset()  # Membership view of _shared_names
+_visible_set_by_owner: dict[int, frozenset[str]] = {}  # Membership view of _visible_by_owner
+_label_by_name: dict[str, str] = {}
 _backends: dict[str, CalendarBackend] = {}
 
+_now: Callable[[], datetime] = datetime.now  # Clock seam; tests replace it
 
-def _init_backend(account: CalendarAccount) -> CalendarBackend:
-    """Create backend instance for a calendar account."""
-    if account.type == "ews":
-        from .backends.ews import EWSBackend
-        return EWSBackend(account.name, account.config)
-    elif account.type == "google":
-        from .backends.google import GoogleCalendarBackend
-        return GoogleCalendarBackend(account.name, account.config)
-    elif account.type == "caldav":
-        from .backends.caldav_backend import CalDAVBackend
-        return CalDAVBackend(account.name, account.config)
+
+# Shared, never mutated: returned as-is whenever no accounts are configured
+_NO_ACCOUNTS_ERROR: dict[str, str] = {"error": "No calendars configured. Set CALENDAR_CONFIG env var."}
+
+
+def _set_accounts(accounts: dict[str, CalendarAccount]) -> None:
+    """Install the account table and rebuild the values derived from it."""
+    global _accounts, _account_names, _shared_names, _visible_by_owner, _label_by_name
+    global _shared_set, _visible_set_by_owner
+    _accounts = accounts
+    _account_names = tuple(accounts)
+    _label_by_name = {name: acct.label for name, acct in accounts.items()}
+    _shared_names = tuple(name for name, acct in accounts.items() if acct.visibility == "shared")
+    owners = {acct.owner_id for acct in accounts.values() if acct.owner_id is not None}
+    _visible_by_owner = {
+        owner: tuple(name for name, acct in accounts.items() if acct.visibility == "shared" or acct.owner_id == owner)
+        for owner in owners
+    }
+    _shared_set = frozenset(_shared_names)
+    _visible_set_by_owner = {owner: frozenset(names) for owner, names in _visible_by_owner.items()}
+
+
+def _get_accounts() -> dict[str, CalendarAccount]:
+    """Return configured accounts, loading the config on first access.
+
+    main() calls this once at startup to validate the config; tests install
+    accounts directly via _set_accounts.
+    """
+    if _accounts is None:
+        accounts = load_config()
+        if accounts:
+            logger.info("Loaded %d calendar(s): %s", len(accounts), list(accounts))
+        else:
+            logger.warning("No calendars loaded (CALENDAR_CONFIG=%s)", os.environ.get("CALENDAR_CONFIG", ""))
+        _set_accounts(accounts)
+    return _accounts
+
+
+# Backend classes by type, imported on first use (exchangelib et al. are slow to import)
+_BACKEND_FACTORIES: dict[str, Callable[[str, Mapping[str, Any]], CalendarBackend]] = {}
+
+
+def _backend_factory(cal_type: str) -> Callable[[str, Mapping[str, Any]], CalendarBackend]:
+    """Import and cache the backend class for a calendar type."""
+    factory = _BACKEND_FACTORIES.get(cal_type)
+    if factory is not None:
+        return factory
+    if cal_type == "ews":
+        from .backends.ews import EWSBackend as factory
+    elif cal_type == "google":
+        from .backends.google import GoogleCalendarBackend as factory
+    elif cal_type == "caldav":
+        from .backends.caldav_backend import CalDAVBackend as factory
     else:
-        raise ValueError(f"Unknown backend type: {account.type}")
+        raise ValueError(f"Unknown backend type: {cal_type}")
+    _BACKEND_FACTORIES[cal_type] = factory
+    return factory
+
+
+def _init_backend(account: CalendarAccount) -> CalendarBackend:
+    """Create backend instance for a calendar account.
+
+    Backends read resolved credentials as config['_username'] etc., so they
+    are merged in here rather than stored in the account's config.
+    """
+    config = {**account.config, **account.credentials} if account.credentials else account.config
+    return _backend_factory(account.type)(account.name, config)
 
 
 def _get_backend(calendar: str) -> CalendarBackend | None:
-    """Get backend by calendar name. Lazy-initializes on first access."""
-    if calendar not in _accounts:
+    """Get backend by calendar name. Lazy-initializes on first access.
+
+    Safe to call from the event loop: backend constructors do no I/O. The
+    expensive connect/discovery step runs on the backend's own executor on
+    first use, behind a per-backend init lock.
+    """
+    accounts = _get_accounts()
+    if calendar not in accounts:
         return None
     if calendar not in _backends:
-        _backends[calendar] = _init_backend(_accounts[calendar])
+        _backends[calendar] = _init_backend(accounts[calendar])
     return _backends[calendar]
 
 
 def _validate_calendar(calendar: str) -> dict | None:
     """Return error dict if calendar is invalid, None if valid."""
-    if not _accounts:
-        return {"error": "No calendars configured. Set CALENDAR_CONFIG env var."}
-    if calendar not in _accounts:
-        return {"error": f"Unknown calendar '{calendar}'. Available: {list(_accounts.keys())}"}
+    accounts = _get_accounts()
+    if not accounts:
+        return _NO_ACCOUNTS_ERROR
+    if calendar not in accounts:
+        return {"error": f"Unknown calendar '{calendar}'. Available: {list(_account_names)}"}
     return None
 
 
-def _visible_calendars(user_id: int | None) -> dict[str, CalendarAccount]:
-    """Return calendars visible to user_id. None = all (no auth)."""
+def _user_can_see(user_id: int | None, calendar: str) -> bool:
+    """Whether user_id may access calendar (must exist). None = no auth, sees all."""
     if user_id is None:
-        return dict(_accounts)
-    return {
-        name: acct for name, acct in _accounts.items()
-        if acct.visibility == "shared" or acct.owner_id == user_id
-    }
+        return True
+    _get_accounts()
+    return calendar in _visible_set_by_owner.get(user_id, _shared_set)
+
+
+def _visible_names(user_id: int | None) -> tuple[str, ...]:
+    """Return names of calendars visible to user_id, in config order. None = all (no auth).
+
+    Served from the immutable indexes built by _set_accounts.
+    """
+    _get_accounts()
+    if user_id is None:
+        return _account_names
+    return _visible_by_owner.get(user_id, _shared_names)
 
 
 def _check_calendar_access(calendar: str, user_id: int | None) -> dict | None:
@@ -85,39 +169,50 @@ def _check_calendar_access(calendar: str, user_id: int | None) -> dict | None:
     err = _validate_calendar(calendar)
     if err:
         return err
-    if user_id is None:
-        return None
-    acct = _accounts[calendar]
-    if acct.visibility == "shared" or acct.owner_id == user_id:
+    if _user_can_see(user_id, calendar):
         return None
     return {"error": f"Access denied: calendar '{calendar}' is not visible to you"}
 
 
+_EVENT_KEYS = ("id", "calendar", "title", "start", "end", "description", "location", "all_day")
+_event_fields = attrgetter("id", "calendar", "title", "start_iso", "end_iso", "description", "location", "all_day")
+
+
 def _event_to_dict(event: CalendarEvent) -> dict[str, Any]:
     """Convert CalendarEvent to JSON-friendly dict."""
-    return {
-        "id": event.id,
-        "calendar": event.calendar,
-        "title": event.title,
-        "start": event.start.isoformat(),
-        "end": event.end.isoformat(),
-        "description": event.description,
-        "location": event.location,
-        "all_day": event.all_day,
-    }
+    return dict(zip(_EVENT_KEYS, _event_fields(event)))
 
 
 def _parse_datetime(value: str) -> datetime:
-    """Parse ISO 8601 datetime string. Supports date-only and datetime."""
-    from dateutil.parser import parse as parse_dt
-    return parse_dt(value)
+    """Parse ISO 8601 datetime string. Supports date-only and datetime.
+
+    Strict ISO input takes the fast fromisoformat path; anything else
+    falls back to dateutil's lenient parser.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parse_dt(value)
 
 
 # ---------------------------------------------------------------------------
 # MCP Server + Tools
 # ---------------------------------------------------------------------------
 
-mcp = FastMCP("renfield-calendar")
+@asynccontextmanager
+async def _lifespan(_server: FastMCP) -> AsyncIterator[None]:
+    """Release backend resources (HTTP sessions, worker threads) on shutdown."""
+    try:
+        yield
+    finally:
+        for cal_name, backend in _backends.items():
+            try:
+                await backend.aclose()
+            except Exception as e:
+                logger.warning("Failed to close backend '%s': %s", cal_name, e)
+
+
+mcp = FastMCP("renfield-calendar", lifespan=_lifespan)
 
 
 @mcp.tool()
@@ -129,13 +224,14 @@ async def list_calendars(user_id: int | None = None) -> dict:
     Args:
         user_id: User ID for visibility filtering (injected by Renfield). None = all calendars.
     """
-    visible = _visible_calendars(user_id)
+    visible = _visible_names(user_id)
     if not visible:
         return {"error": "No calendars configured"}
+    accounts = _get_accounts()
     return {
         "calendars": [
             {"name": a.name, "label": a.label, "type": a.type}
-            for a in visible.values()
+            for a in (accounts[name] for name in visible)
         ]
     }
 
@@ -158,8 +254,12 @@ async def list_events(
         end: End date/time (ISO 8601). Default: today 23:59.
         user_id: User ID for visibility filtering (injected by Renfield). None = all calendars.
     """
+    # Nothing to query — skip date parsing entirely
+    if not _get_accounts():
+        return _NO_ACCOUNTS_ERROR
+
     # Parse date range
-    now = datetime.now()
+    now = _now()
     if start:
         try:
             dt_start = _parse_datetime(start)
@@ -181,12 +281,12 @@ async def list_events(
         err = _check_calendar_access(calendar, user_id)
         if err:
             return err
-        calendars_to_query = [calendar]
+        calendars_to_query = (calendar,)
     else:
-        calendars_to_query = list(_visible_calendars(user_id).keys())
+        calendars_to_query = _visible_names(user_id)
 
-    # Fetch events from all requested calendars
-    all_events: list[CalendarEvent] = []
+    # Fetch events from all requested calendars concurrently
+    backends: dict[str, CalendarBackend] = {}
     errors: list[str] = []
 
     for cal_name in calendars_to_query:
@@ -194,22 +294,20 @@ async def list_events(
         if not backend:
             errors.append(f"Backend not available: {cal_name}")
             continue
-        try:
-            events = await backend.list_events(dt_start, dt_end)
-            all_events.extend(events)
-        except Exception as e:
-            logger.warning("Failed to fetch events from '%s': %s", cal_name, e)
-            errors.append(f"{cal_name}: {e}")
+        backends[cal_name] = backend
 
-    # Sort chronologically
-    all_events.sort(key=lambda e: e.start)
+    # Merged chronologically
+    all_events, failures = await list_all_events(backends, dt_start, dt_end)
+    for cal_name, e in failures.items():
+        logger.warning("Failed to fetch events from '%s': %s", cal_name, e)
+        errors.append(f"{cal_name}: {e}")
 
     result: dict[str, Any] = {
-        "calendars_queried": calendars_to_query,
+        "calendars_queried": list(calendars_to_query),
         "start": dt_start.isoformat(),
         "end": dt_end.isoformat(),
         "count": len(all_events),
-        "events": [_event_to_dict(e) for e in all_events],
+        "events": list(map(_event_to_dict, all_events)),
     }
     if errors:
         result["errors"] = errors
@@ -370,6 +468,16 @@ async def get_event(calendar: str, event_id: str, user_id: int | None = None) ->
         return {"error": f"Failed to get event: {e}"}
 
 
+# Stable per (calendar, event, threshold) so Renfield can drop repeat reminders
+_DEDUP_KEY_FORMAT = "calendar:%s:%s:%dmin"
+
+# Reminder marks: (minutes, window low, window high, urgency)
+_THRESHOLDS = (
+    (30, 25, 35, "info"),   # "In 30 Minuten"
+    (5, 2, 8, "warning"),   # "In 5 Minuten"
+)
+
+
 @mcp.tool()
 async def get_pending_notifications(
     lookahead_minutes: int = 45,
@@ -389,41 +497,35 @@ async def get_pending_notifications(
         List of notification dicts with event_type, title, message, urgency,
         scheduled_at, dedup_key, and data fields.
     """
-    now = datetime.now()
+    now = _now()
     dt_end = now + timedelta(minutes=lookahead_minutes)
 
-    # Collect events from visible calendars
-    visible = _visible_calendars(user_id)
-    all_events: list[CalendarEvent] = []
-    for cal_name in visible:
+    # Collect events from visible calendars concurrently
+    backends: dict[str, CalendarBackend] = {}
+    for cal_name in _visible_names(user_id):
         backend = _get_backend(cal_name)
-        if not backend:
-            continue
-        try:
-            events = await backend.list_events(now, dt_end)
-            all_events.extend(events)
-        except Exception as e:
-            logger.warning("Notification poll: failed to fetch from '%s': %s", cal_name, e)
+        if backend:
+            backends[cal_name] = backend
+
+    all_events, failures = await list_all_events(backends, now, dt_end)
+    for cal_name, e in failures.items():
+        logger.warning("Notification poll: failed to fetch from '%s': %s", cal_name, e)
 
     if not all_events:
         return []
 
+    accounts = _get_accounts()
     notifications = []
     for event in all_events:
         minutes_until = (event.start - now).total_seconds() / 60
 
         # Generate reminders at meaningful intervals
-        reminder_thresholds = [
-            (30, 5, "info"),    # 25-35 min: "In 30 Minuten"
-            (5, 3, "warning"),  # 2-8 min: "In 5 Minuten"
-        ]
-
-        for threshold, tolerance, urgency in reminder_thresholds:
-            if abs(minutes_until - threshold) <= tolerance:
-                cal_label = _accounts[event.calendar].label if event.calendar in _accounts else event.calendar
+        for threshold, low, high, urgency in _THRESHOLDS:
+            if low <= minutes_until <= high:
+                cal_label = _label_by_name.get(event.calendar, event.calendar)
 
                 # Derive privacy level from calendar account visibility
-                acct = _accounts.get(event.calendar)
+                acct = accounts.get(event.calendar)
                 if acct and acct.visibility == "owner":
                     privacy = "confidential"
                     target_user_id = acct.owner_id
@@ -436,20 +538,21 @@ async def get_pending_notifications(
                     "title": event.title,
                     "message": f"In {threshold} Minuten: {event.title} ({cal_label})",
                     "urgency": urgency,
-                    "scheduled_at": event.start.isoformat(),
-                    "dedup_key": f"calendar:{event.calendar}:{event.id}:{threshold}min",
+                    "scheduled_at": event.start_iso,
+                    "dedup_key": _DEDUP_KEY_FORMAT % (event.calendar, event.id, threshold),
                     "tts": True,
                     "privacy": privacy,
                     "target_user_id": target_user_id,
                     "data": {
                         "calendar": event.calendar,
                         "event_id": event.id,
-                        "event_start": event.start.isoformat(),
-                        "event_end": event.end.isoformat(),
+                        "event_start": event.start_iso,
+                        "event_end": event.end_iso,
                         "minutes_until": round(minutes_until),
                         "location": event.location,
                     },
                 })
+                break  # Windows don't overlap
 
     return notifications
 
@@ -460,11 +563,12 @@ async def get_pending_notifications(
 
 def _run_google_auth(calendar_name: str) -> None:
     """Interactive OAuth2 flow for Google Calendar. Run once to obtain token."""
-    if calendar_name not in _accounts:
-        print(f"Unknown calendar: {calendar_name}. Available: {list(_accounts.keys())}", file=sys.stderr)
+    accounts = _get_accounts()
+    if calendar_name not in accounts:
+        print(f"Unknown calendar: {calendar_name}. Available: {list(_account_names)}", file=sys.stderr)
         sys.exit(1)
 
-    account = _accounts[calendar_name]
+    account = accounts[calendar_name]
     if account.type != "google":
         print(f"Calendar '{calendar_name}' is type '{account.type}', not 'google'", file=sys.stderr)
         sys.exit(1)
@@ -476,7 +580,6 @@ def _run_google_auth(calendar_name: str) -> None:
     token_file = account.config.get("token_file", "/data/google_calendar_token.json")
 
     import json
-    import os
 
     if not os.path.isfile(credentials_file):
         print(f"Credentials file not found: {credentials_file}", file=sys.stderr)
@@ -500,24 +603,23 @@ def _run_google_auth(calendar_name: str) -> None:
 
 def main():
     """Entry point for console script and python -m."""
-    global _accounts
+    parser = argparse.ArgumentParser(prog="renfield-mcp-calendar", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--auth", nargs="?", const="", metavar="PROVIDER",
+                        help="Run the OAuth2 setup flow (only 'google' is supported)")
+    parser.add_argument("--calendar", default="", help="Calendar to authenticate (default: first Google calendar)")
+    args, _ = parser.parse_known_args()
 
     # Handle --auth flag for Google OAuth2 setup
-    if "--auth" in sys.argv:
-        _accounts = load_config()
-        idx = sys.argv.index("--auth")
-        provider = sys.argv[idx + 1] if idx + 1 < len(sys.argv) else ""
-        if provider != "google":
-            print(f"Only --auth google is supported, got: {provider}", file=sys.stderr)
+    if args.auth is not None:
+        if args.auth != "google":
+            print(f"Only --auth google is supported, got: {args.auth}", file=sys.stderr)
             sys.exit(1)
         # Find calendar name
-        cal_name = ""
-        if "--calendar" in sys.argv:
-            cal_idx = sys.argv.index("--calendar")
-            cal_name = sys.argv[cal_idx + 1] if cal_idx + 1 < len(sys.argv) else ""
+        cal_name = args.calendar
         if not cal_name:
             # Find first google calendar
-            for name, acct in _accounts.items():
+            for name, acct in _get_accounts().items():
                 if acct.type == "google":
                     cal_name = name
                     break
@@ -527,11 +629,19 @@ def main():
         _run_google_auth(cal_name)
         return
 
-    _accounts = load_config()
-    if _accounts:
-        logger.info("Loaded %d calendar(s): %s", len(_accounts), list(_accounts.keys()))
-    else:
-        logger.warning("No calendars loaded (CALENDAR_CONFIG=%s)", __import__("os").environ.get("CALENDAR_CONFIG", ""))
+    # Validate the config before serving, so a malformed file fails fast
+    # instead of erroring on every tool call and notification poll
+    try:
+        accounts = _get_accounts()
+    except ValueError as e:
+        logger.error("Invalid calendar config: %s", e)
+        sys.exit(1)
+
+    # Backends are created lazily by the first tool call, unless the first
+    # request should not pay for it
+    if os.environ.get("CALENDAR_EAGER_LOAD"):
+        for cal_name in accounts:
+            _get_backend(cal_name)
     mcp.run(transport="stdio")
 
 
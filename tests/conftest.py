@@ -0,0 +1,23 @@
+"""Shared pytest configuration."""
+
+import yaml
+
+try:
+    import uvloop
+except ImportError:  # optional dev dependency; not available on Windows
+    uvloop = None
+
+# Import the package before collection so every xdist worker pays it up front
+import renfield_mcp_calendar.server  # noqa: F401
+from renfield_mcp_calendar import config as config_module
+
+
+def pytest_sessionstart(session):
+    # First parse initializes libyaml's loader state; keep that out of the first config test
+    yaml.load("a: 1", Loader=config_module._Loader)
+
+
+if uvloop is not None:
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
@@ -0,0 +1,389 @@
+"""Tests for calendar backend parsing helpers."""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import icalendar
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from renfield_mcp_calendar.backends import caldav_backend as caldav_module
+from renfield_mcp_calendar.backends import google as google_module
+from renfield_mcp_calendar.backends.caldav_backend import CalDAVBackend
+from renfield_mcp_calendar.backends.google import GoogleCalendarBackend
+
+
+@pytest.fixture
+def caldav_backend():
+    backend = CalDAVBackend("verein", {
+        "url": "https://nextcloud.example.com/dav/",
+        "username_env": "CAL_V_USER",
+        "password_env": "CAL_V_PASS",
+        "_username": "u",
+        "_password": "p",
+    })
+    yield backend
+    backend._executor.shutdown(wait=False)
+
+
+def _vcal(*vevent_lines: str) -> str:
+    return "\r\n".join([
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//test//EN",
+        "BEGIN:VEVENT",
+        *vevent_lines,
+        "END:VEVENT",
+        "END:VCALENDAR",
+        "",
+    ])
+
+
+# ---------------------------------------------------------------------------
+# CalDAV fast VEVENT parsing
+# ---------------------------------------------------------------------------
+
+class TestCalDAVFastParse:
+    def test_timed_event(self, caldav_backend):
+        data = _vcal(
+            "UID:evt-1",
+            "DTSTART:20260213T140000",
+            "DTEND:20260213T150000",
+            "SUMMARY:Vorstandssitzung",
+            "LOCATION:Vereinsheim",
+        )
+        [event] = caldav_backend._parse_vevents_fast(data)
+        assert event.id == "evt-1"
+        assert event.calendar == "verein"
+        assert event.title == "Vorstandssitzung"
+        assert event.start == datetime(2026, 2, 13, 14, 0)
+        assert event.end == datetime(2026, 2, 13, 15, 0)
+        assert event.location == "Vereinsheim"
+        assert event.all_day is False
+
+    def test_all_day_event(self, caldav_backend):
+        data = _vcal("UID:evt-2", "DTSTART;VALUE=DATE:20260214", "DTEND;VALUE=DATE:20260215")
+        [event] = caldav_backend._parse_vevents_fast(data)
+        assert event.all_day is True
+        assert event.start == datetime(2026, 2, 14)
+        assert event.end == datetime(2026, 2, 15)
+        assert event.title == "(Kein Titel)"
+
+    def test_folding_escaping_and_alarms(self, caldav_backend):
+        data = _vcal(
+            "UID:evt-3",
+            "DTSTART:20260213T140000Z",
+            "SUMMARY:Sommerfest\\, Grillen",
+            "DESCRIPTION:Zeile eins\\nZeile",
+            "  zwei",
+            "BEGIN:VALARM",
+            "ACTION:DISPLAY",
+            "DESCRIPTION:Reminder",
+            "END:VALARM",
+        )
+        [event] = caldav_backend._parse_vevents_fast(data)
+        assert event.title == "Sommerfest, Grillen"
+        assert event.description == "Zeile eins\nZeile zwei"
+        assert event.end == event.start
+
+    def test_matches_icalendar_path(self, caldav_backend):
+        data = _vcal(
+            "UID:evt-4",
+            "DTSTART:20260213T090000Z",
+            "DTEND:20260213T100000Z",
+            "SUMMARY;LANGUAGE=de:Training",
+            "DESCRIPTION:Halle 2\\; Eingang Nord",
+        )
+        fast = caldav_backend._parse_vevents_fast(data)
+        slow = [caldav_backend._parse_vevent(v) for v in icalendar.Calendar.from_ical(data).walk("VEVENT")]
+        assert fast == slow
+
+    def test_unicode_line_separators_kept_in_values(self, caldav_backend):
+        data = _vcal(
+            "UID:evt-6",
+            "DTSTART:20260213T140000",
+            "SUMMARY:Zeile\u2028zwei",
+            "DESCRIPTION:a\x0cb\x85c\x1ed",
+        )
+        fast = caldav_backend._parse_vevents_fast(data)
+        slow = [caldav_backend._parse_vevent(v) for v in icalendar.Calendar.from_ical(data).walk("VEVENT")]
+        assert fast == slow
+        assert fast[0].title == "Zeile\u2028zwei"
+
+    def test_lowercase_component_names(self, caldav_backend):
+        data = _vcal("UID:evt-7", "DTSTART:20260213T140000", "SUMMARY:Training")
+        data = data.replace("BEGIN:", "begin:").replace("END:", "end:").replace("VEVENT", "vevent")
+        fast = caldav_backend._parse_vevents_fast(data)
+        slow = [caldav_backend._parse_vevent(v) for v in icalendar.Calendar.from_ical(data).walk("VEVENT")]
+        assert len(fast) == 1
+        assert fast == slow
+
+    def test_tzid_falls_back(self, caldav_backend):
+        data = _vcal("UID:evt-5", "DTSTART;TZID=Europe/Berlin:20260213T140000")
+        assert caldav_backend._parse_vevents_fast(data) is None
+
+
+# ---------------------------------------------------------------------------
+# Lazy init
+# ---------------------------------------------------------------------------
+
+class TestLazyInit:
+    def test_caldav_concurrent_init_connects_once(self, caldav_backend):
+        barrier = threading.Barrier(4)
+
+        def slow_client(**kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+
+        with patch("caldav.DAVClient", side_effect=slow_client) as mock_client, \
+                patch("caldav.Calendar") as mock_calendar:
+            def worker():
+                barrier.wait()
+                return caldav_backend._get_calendar()
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(lambda _: worker(), range(4)))
+
+        assert mock_client.call_count == 1
+        assert all(r is mock_calendar.return_value for r in results)
+
+    def test_tune_session_uses_adapter_retry(self):
+        niquests = pytest.importorskip("niquests")
+        session = niquests.Session()
+        CalDAVBackend._tune_session(SimpleNamespace(session=session))
+        adapter = session.get_adapter("https://nextcloud.example.com/")
+        assert isinstance(adapter.max_retries, niquests.adapters.Retry)
+        assert adapter.max_retries.total == 3
+
+
+# ---------------------------------------------------------------------------
+# CalDAV calendar-URL cache
+# ---------------------------------------------------------------------------
+
+CALDAV_URL = "https://nextcloud.example.com/dav/"
+CALENDAR_URL = "https://nextcloud.example.com/dav/calendars/u/verein/"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(caldav_module, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _head_client(status: int = 200) -> MagicMock:
+    client = MagicMock()
+    client.request.return_value.status = status
+    return client
+
+
+class TestCalDAVUrlCache:
+    def test_hit_after_save(self, caldav_backend, cache_dir):
+        caldav_backend._save_cached_calendar(CALDAV_URL, "Verein", CALENDAR_URL)
+        client = _head_client()
+        with patch("caldav.Calendar") as mock_calendar:
+            result = caldav_backend._load_cached_calendar(client, CALDAV_URL, "Verein")
+        client.request.assert_called_once_with(CALENDAR_URL, "HEAD")
+        mock_calendar.assert_called_once_with(client=client, url=CALENDAR_URL)
+        assert result is mock_calendar.return_value
+
+    @pytest.mark.parametrize("failure", [404, ConnectionError("boom")], ids=["http-404", "exception"])
+    def test_failed_validation_invalidates_entry(self, caldav_backend, cache_dir, failure):
+        caldav_backend._save_cached_calendar(CALDAV_URL, "Verein", CALENDAR_URL)
+        client = MagicMock()
+        if isinstance(failure, int):
+            client.request.return_value.status = failure
+        else:
+            client.request.side_effect = failure
+        assert caldav_backend._load_cached_calendar(client, CALDAV_URL, "Verein") is None
+        assert not (cache_dir / "caldav_verein.url").exists()
+
+    @pytest.mark.parametrize("url,name", [
+        ("https://other.example.com/dav/", "Verein"),
+        (CALDAV_URL, "Familie"),
+    ], ids=["url-changed", "filter-changed"])
+    def test_mismatch_skips_validation(self, caldav_backend, cache_dir, url, name):
+        caldav_backend._save_cached_calendar(CALDAV_URL, "Verein", CALENDAR_URL)
+        client = _head_client()
+        assert caldav_backend._load_cached_calendar(client, url, name) is None
+        client.request.assert_not_called()
+
+    def test_expired_entry_skips_validation(self, caldav_backend, cache_dir, monkeypatch):
+        caldav_backend._save_cached_calendar(CALDAV_URL, "Verein", CALENDAR_URL)
+        later = time.time() + caldav_module.CACHE_MAX_AGE + 1
+        monkeypatch.setattr(caldav_module.time, "time", lambda: later)
+        client = _head_client()
+        assert caldav_backend._load_cached_calendar(client, CALDAV_URL, "Verein") is None
+        client.request.assert_not_called()
+
+    @pytest.mark.parametrize("content", ["{not json", "[]", json.dumps({"url": CALDAV_URL})],
+                             ids=["invalid-json", "not-an-object", "missing-fields"])
+    def test_corrupt_file_ignored(self, caldav_backend, cache_dir, content):
+        (cache_dir / "caldav_verein.url").write_text(content)
+        client = _head_client()
+        assert caldav_backend._load_cached_calendar(client, CALDAV_URL, "Verein") is None
+        client.request.assert_not_called()
+
+    def test_missing_file(self, caldav_backend, cache_dir):
+        assert caldav_backend._load_cached_calendar(_head_client(), CALDAV_URL, "Verein") is None
+
+
+# ---------------------------------------------------------------------------
+# Google REST backend (against a local aiohttp server)
+# ---------------------------------------------------------------------------
+
+class _FakeCreds:
+    """Stands in for google.oauth2 Credentials; refresh() issues t2, t3, ..."""
+
+    def __init__(self, token: str = "t1"):
+        self.token = token
+        self.valid = True
+        self.expired = False
+        self.refresh_token = "refresh"
+        self.refresh_count = 0
+
+    def refresh(self, request) -> None:
+        self.refresh_count += 1
+        self.token = f"t{self.refresh_count + 1}"
+
+    def to_json(self) -> str:
+        return json.dumps({"token": self.token})
+
+
+@pytest.fixture
+async def google_api():
+    """Fake Calendar API; handlers and accepted tokens are set per test on the returned state."""
+    api = SimpleNamespace(requests=[], accepted_tokens={"t1"}, pages={}, items={})
+
+    def authorized(request):
+        api.requests.append((request.method, request.path, dict(request.query)))
+        return request.headers.get("Authorization", "").removeprefix("Bearer ") in api.accepted_tokens
+
+    async def list_events(request):
+        if not authorized(request):
+            return web.Response(status=401)
+        return web.json_response(api.pages[request.query.get("pageToken", "")])
+
+    async def get_event(request):
+        if not authorized(request):
+            return web.Response(status=401)
+        return web.json_response(api.items[request.match_info["event_id"]])
+
+    async def patch_event(request):
+        if not authorized(request):
+            return web.Response(status=401)
+        api.patch_body = await request.json()
+        return web.json_response({**api.items[request.match_info["event_id"]], **api.patch_body})
+
+    async def delete_event(request):
+        if not authorized(request):
+            return web.Response(status=401)
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_get("/events", list_events)
+    app.router.add_get("/events/{event_id}", get_event)
+    app.router.add_patch("/events/{event_id}", patch_event)
+    app.router.add_delete("/events/{event_id}", delete_event)
+    server = TestServer(app)
+    await server.start_server()
+    api.url = str(server.make_url("/events"))
+    yield api
+    await server.close()
+
+
+@pytest.fixture
+async def google_backend(google_api, tmp_path):
+    backend = GoogleCalendarBackend("family", {
+        "credentials_file": str(tmp_path / "creds.json"),
+        "token_file": str(tmp_path / "token.json"),
+    })
+    backend._events_url = google_api.url
+    backend._creds = _FakeCreds()
+    yield backend
+    await backend.aclose()
+
+
+def _timed_item(event_id: str, start: str, end: str, **extra) -> dict:
+    return {"id": event_id, "start": {"dateTime": start}, "end": {"dateTime": end}, **extra}
+
+
+class TestGoogleBackend:
+    async def test_list_events_follows_pages(self, google_api, google_backend):
+        google_api.pages = {
+            "": {
+                "items": [_timed_item("e1", "2026-02-13T14:00:00+01:00", "2026-02-13T15:00:00+01:00",
+                                      summary="Elternabend")],
+                "nextPageToken": "p2",
+            },
+            "p2": {"items": [{"id": "e2", "start": {"date": "2026-02-14"}, "end": {"date": "2026-02-15"}}]},
+        }
+        events = await google_backend.list_events(datetime(2026, 2, 13), datetime(2026, 2, 15))
+
+        assert [e.id for e in events] == ["e1", "e2"]
+        timed, all_day = events
+        assert timed.title == "Elternabend"
+        assert timed.start == datetime(2026, 2, 13, 14, 0)
+        assert timed.all_day is False
+        assert all_day.all_day is True
+        assert all_day.start == datetime(2026, 2, 14)
+        assert all_day.title == "(Kein Titel)"
+
+        [first, second] = google_api.requests
+        assert first[2]["fields"] == google_module.LIST_FIELDS
+        assert first[2]["timeMin"] == "2026-02-13T00:00:00Z"
+        assert "pageToken" not in first[2]
+        assert second[2]["pageToken"] == "p2"
+
+    async def test_list_events_truncated_after_max_pages(self, google_api, google_backend, monkeypatch, caplog):
+        monkeypatch.setattr(google_module, "MAX_PAGES", 2)
+        google_api.pages = {"": {"items": [], "nextPageToken": "more"}, "more": {"items": [], "nextPageToken": "more"}}
+
+        with caplog.at_level(logging.WARNING, logger="renfield-mcp-calendar"):
+            events = await google_backend.list_events(datetime(2026, 2, 13), datetime(2026, 2, 14))
+
+        assert events == []
+        assert len(google_api.requests) == 2
+        assert "result truncated" in caplog.text
+
+    async def test_update_event_patches_changed_fields_only(self, google_api, google_backend):
+        google_api.items["e1"] = _timed_item("e1", "2026-02-13T14:00:00Z", "2026-02-13T15:00:00Z", summary="Alt")
+
+        event = await google_backend.update_event("e1", title="Neu")
+
+        assert google_api.patch_body == {"summary": "Neu"}
+        assert [r[0] for r in google_api.requests] == ["PATCH"]
+        assert event.title == "Neu"
+        assert event.start == datetime(2026, 2, 13, 14, 0)
+
+    async def test_delete_event_handles_204(self, google_backend):
+        assert await google_backend.delete_event("e1") is True
+
+    async def test_get_event_all_day(self, google_api, google_backend):
+        google_api.items["e1"] = {"id": "e1", "summary": "Urlaub",
+                                  "start": {"date": "2026-02-14"}, "end": {"date": "2026-02-16"}}
+        event = await google_backend.get_event("e1")
+        assert event.all_day is True
+        assert event.end == datetime(2026, 2, 16)
+
+    async def test_rejected_token_refreshed_and_retried(self, google_api, google_backend, tmp_path):
+        google_api.accepted_tokens = {"t2"}
+        await google_backend.delete_event("e1")
+
+        assert google_backend._creds.refresh_count == 1
+        assert len(google_api.requests) == 2
+        assert json.loads((tmp_path / "token.json").read_text()) == {"token": "t2"}
+
+    async def test_second_401_raises(self, google_api, google_backend):
+        google_api.accepted_tokens = set()
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await google_backend.delete_event("e1")
+        assert exc_info.value.status == 401
+        assert google_backend._creds.refresh_count == 1
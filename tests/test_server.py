@@ -1,14 +1,18 @@
 """Tests for renfield-mcp-calendar server."""
 
+import asyncio
+import inspect
 import textwrap
-from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import replace
+from datetime import datetime, timedelta
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from renfield_mcp_calendar import config as config_module
 from renfield_mcp_calendar import server
-from renfield_mcp_calendar.backends.base import CalendarEvent
+from renfield_mcp_calendar.backends.base import CalendarBackend, CalendarEvent, list_all_events
 from renfield_mcp_calendar.config import CalendarAccount
 
 
@@ -16,16 +20,25 @@ from renfield_mcp_calendar.config import CalendarAccount
 # Fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def _reset_state():
-    """Reset module-level state between tests."""
-    server._accounts = {}
-    server._backends = {}
-    yield
-    server._accounts = {}
+    """Start the test with no accounts and no cached backends.
+
+    Opt-in via usefixtures for tests that read or write server state.
+    Setup-only: every such test resets on entry, so no teardown is needed.
+    """
+    server._set_accounts({})
     server._backends = {}
 
 
+_DEFAULT_EWS_CONFIG = MappingProxyType({
+    "ews_url": "https://exchange.example.com/EWS/Exchange.asmx",
+    "username_env": "CAL_TEST_USER",
+    "password_env": "CAL_TEST_PASS",
+})
+_PROTO_ACCOUNT = CalendarAccount(name="test", label="Test Calendar", type="ews", config=_DEFAULT_EWS_CONFIG)
+
+
 def _make_account(
     name: str = "test",
     label: str = "Test Calendar",
@@ -34,18 +47,178 @@ def _make_account(
     visibility: str = "shared",
     owner_id: int | None = None,
 ) -> CalendarAccount:
-    if config is None:
-        config = {
-            "ews_url": "https://exchange.example.com/EWS/Exchange.asmx",
-            "username_env": "CAL_TEST_USER",
-            "password_env": "CAL_TEST_PASS",
-        }
-    return CalendarAccount(
-        name=name, label=label, type=cal_type, config=config,
+    return replace(
+        _PROTO_ACCOUNT, name=name, label=label, type=cal_type,
+        config=_DEFAULT_EWS_CONFIG if config is None else config,
         visibility=visibility, owner_id=owner_id,
     )
 
 
+def _load_config_text(yaml_text: str, env: dict[str, str] | None = None) -> dict[str, CalendarAccount]:
+    """Run the config parser on yaml_text with env vars temporarily set."""
+    with pytest.MonkeyPatch.context() as mp:
+        for key, value in (env or {}).items():
+            mp.setenv(key, value)
+        return config_module.load_config_from_text(yaml_text)
+
+
+# Config documents, dedented once at import
+
+EWS_YAML = textwrap.dedent("""\
+    calendars:
+      - name: work
+        label: "Firmenkalender"
+        type: ews
+        ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
+        username_env: CAL_WORK_USER
+        password_env: CAL_WORK_PASS
+""")
+EWS_ENV = {"CAL_WORK_USER": "user@example.com", "CAL_WORK_PASS": "secret"}
+
+GOOGLE_YAML = textwrap.dedent("""\
+    calendars:
+      - name: family
+        label: "Familienkalender"
+        type: google
+        calendar_id: "primary"
+        credentials_file: "/config/google_creds.json"
+        token_file: "/data/google_token.json"
+""")
+
+CALDAV_YAML = textwrap.dedent("""\
+    calendars:
+      - name: verein
+        label: "Vereinskalender"
+        type: caldav
+        url: "https://nextcloud.example.com/remote.php/dav/calendars/user/verein/"
+        username_env: CAL_VEREIN_USER
+        password_env: CAL_VEREIN_PASS
+""")
+CALDAV_ENV = {"CAL_VEREIN_USER": "user", "CAL_VEREIN_PASS": "pass"}
+
+MULTI_YAML = textwrap.dedent("""\
+    calendars:
+      - name: work
+        type: ews
+        ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
+        username_env: CAL_WORK_USER
+        password_env: CAL_WORK_PASS
+      - name: family
+        type: google
+        credentials_file: "/config/creds.json"
+      - name: verein
+        type: caldav
+        url: "https://nextcloud.example.com/dav/"
+        username_env: CAL_V_USER
+        password_env: CAL_V_PASS
+""")
+MULTI_ENV = {"CAL_WORK_USER": "u", "CAL_WORK_PASS": "p", "CAL_V_USER": "u", "CAL_V_PASS": "p"}
+
+OWNER_YAML = textwrap.dedent("""\
+    calendars:
+      - name: work
+        type: ews
+        visibility: owner
+        owner_id: 1
+        ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
+        username_env: U
+        password_env: P
+""")
+
+DUPLICATE_YAML = textwrap.dedent("""\
+    calendars:
+      - name: work
+        type: ews
+        ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
+        username_env: U
+        password_env: P
+      - name: work
+        type: ews
+        ews_url: "https://exchange2.example.com/EWS/Exchange.asmx"
+        username_env: U2
+        password_env: P2
+""")
+
+UNKNOWN_TYPE_YAML = textwrap.dedent("""\
+    calendars:
+      - name: test
+        type: outlook365
+        url: "https://example.com"
+""")
+
+EWS_NO_URL_YAML = textwrap.dedent("""\
+    calendars:
+      - name: work
+        type: ews
+        username_env: U
+        password_env: P
+""")
+
+
+MINIMAL_GOOGLE_YAML = textwrap.dedent("""\
+    calendars:
+      - name: family
+        type: google
+        credentials_file: "/config/creds.json"
+""")
+
+OWNER_NO_ID_YAML = textwrap.dedent("""\
+    calendars:
+      - name: work
+        type: ews
+        visibility: owner
+        ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
+        username_env: U
+        password_env: P
+""")
+
+INVALID_VISIBILITY_YAML = OWNER_NO_ID_YAML.replace("visibility: owner", "visibility: private")
+
+
+# Parsed once per session; tests must not mutate the returned accounts.
+
+@pytest.fixture(scope="session")
+def valid_ews_accounts():
+    return _load_config_text(EWS_YAML, EWS_ENV)
+
+
+@pytest.fixture(scope="session")
+def valid_google_accounts():
+    return _load_config_text(GOOGLE_YAML)
+
+
+@pytest.fixture(scope="session")
+def valid_caldav_accounts():
+    return _load_config_text(CALDAV_YAML, CALDAV_ENV)
+
+
+@pytest.fixture(scope="session")
+def multi_calendar_accounts():
+    return _load_config_text(MULTI_YAML, MULTI_ENV)
+
+
+@pytest.fixture(scope="session")
+def owner_accounts():
+    return _load_config_text(OWNER_YAML)
+
+
+FIXED_NOW = datetime(2026, 2, 13, 14, 0)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Freeze server._now() so reminder offsets are deterministic."""
+    monkeypatch.setattr(server, "_now", lambda: FIXED_NOW)
+    return FIXED_NOW
+
+
+_DEFAULT_START = datetime(2026, 2, 13, 14, 0)
+_DEFAULT_END = datetime(2026, 2, 13, 15, 0)
+_PROTO_EVENT = CalendarEvent(
+    id="evt-1", calendar="test", title="Team Meeting", start=_DEFAULT_START, end=_DEFAULT_END,
+)
+
+
 def _make_event(
     id: str = "evt-1",
     calendar: str = "test",
@@ -53,24 +226,104 @@ def _make_event(
     start: datetime | None = None,
     end: datetime | None = None,
 ) -> CalendarEvent:
-    return CalendarEvent(
-        id=id,
-        calendar=calendar,
-        title=title,
-        start=start or datetime(2026, 2, 13, 14, 0),
-        end=end or datetime(2026, 2, 13, 15, 0),
+    return replace(
+        _PROTO_EVENT, id=id, calendar=calendar, title=title,
+        start=start or _DEFAULT_START, end=end or _DEFAULT_END,
     )
 
 
-def _setup_mock_backend(events: list[CalendarEvent] | None = None) -> AsyncMock:
-    """Create a mock backend and install it."""
-    backend = AsyncMock()
-    backend.list_events = AsyncMock(return_value=events or [])
-    backend.create_event = AsyncMock()
-    backend.update_event = AsyncMock()
-    backend.delete_event = AsyncMock(return_value=True)
-    backend.get_event = AsyncMock()
-    return backend
+def _aret(value):
+    """Async callable that ignores its arguments and returns value."""
+    async def f(*args, **kwargs):
+        return value
+    return f
+
+
+def _araise(exc: BaseException):
+    """Async callable that ignores its arguments and raises exc."""
+    async def f(*args, **kwargs):
+        raise exc
+    return f
+
+
+class _FakeBackend:
+    """Minimal in-memory CalendarBackend; far cheaper to build than an AsyncMock.
+
+    All methods answer from ``events``: create appends, get/update/delete look
+    the id up there and fail like the real backends when it is missing.
+    Tests can still replace any method on the instance with _aret/_araise.
+    ``close_error`` makes aclose raise.
+    """
+
+    def __init__(self, events: list[CalendarEvent] | None = None):
+        self.reset(events)
+
+    def reset(self, events: list[CalendarEvent] | None = None) -> None:
+        """Restore the default canned results and drop per-test method overrides."""
+        self.__dict__.clear()
+        self.events = list(events or ())
+        self.close_error: Exception | None = None
+        self.close_count = 0
+
+    def _lookup(self, event_id: str):
+        """_aret/_araise callable resolving event_id against ``events``."""
+        for event in self.events:
+            if event.id == event_id:
+                return _aret(event)
+        return _araise(ValueError(f"Event not found: {event_id}"))
+
+    async def list_events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        return self.events
+
+    async def create_event(self, title, start, end, description="", location="") -> CalendarEvent:
+        event = replace(
+            _PROTO_EVENT, id=f"new-{len(self.events) + 1}", title=title, start=start, end=end,
+            description=description, location=location,
+        )
+        self.events.append(event)
+        return event
+
+    async def update_event(self, event_id: str, **kwargs: object) -> CalendarEvent:
+        event = await self._lookup(event_id)()
+        updated = replace(event, **kwargs)
+        self.events[self.events.index(event)] = updated
+        return updated
+
+    async def delete_event(self, event_id: str) -> bool:
+        try:
+            event = await self._lookup(event_id)()
+        except ValueError:
+            return False
+        self.events.remove(event)
+        return True
+
+    async def get_event(self, event_id: str) -> CalendarEvent:
+        return await self._lookup(event_id)()
+
+    async def aclose(self) -> None:
+        self.close_count += 1
+        if self.close_error is not None:
+            raise self.close_error
+
+
+def _setup_mock_backend(events: list[CalendarEvent] | None = None) -> _FakeBackend:
+    """Create a fake backend returning the given events."""
+    return _FakeBackend(events)
+
+
+@pytest.fixture(scope="session")
+def backend_pool():
+    """Fake backends shared across the session; handed out by mock_backend."""
+    return [_FakeBackend() for _ in range(4)]
+
+
+@pytest.fixture
+def mock_backend(backend_pool):
+    """A reset fake backend from the pool, returned to it after the test."""
+    backend = backend_pool.pop()
+    backend.reset()
+    yield backend
+    backend_pool.append(backend)
 
 
 # ---------------------------------------------------------------------------
@@ -78,149 +331,78 @@ def _setup_mock_backend(events: list[CalendarEvent] | None = None) -> AsyncMock:
 # ---------------------------------------------------------------------------
 
 class TestLoadConfig:
-    def test_valid_ews_config(self, tmp_path, monkeypatch):
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                label: "Firmenkalender"
-                type: ews
-                ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
-                username_env: CAL_WORK_USER
-                password_env: CAL_WORK_PASS
-        """))
-        monkeypatch.setenv("CAL_WORK_USER", "user@example.com")
-        monkeypatch.setenv("CAL_WORK_PASS", "secret")
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        accounts = config_module.load_config()
-        assert "work" in accounts
-        assert accounts["work"].type == "ews"
-        assert accounts["work"].label == "Firmenkalender"
-
-    def test_valid_google_config(self, tmp_path, monkeypatch):
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: family
-                label: "Familienkalender"
-                type: google
-                calendar_id: "primary"
-                credentials_file: "/config/google_creds.json"
-                token_file: "/data/google_token.json"
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        accounts = config_module.load_config()
-        assert "family" in accounts
-        assert accounts["family"].type == "google"
-
-    def test_valid_caldav_config(self, tmp_path, monkeypatch):
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: verein
-                label: "Vereinskalender"
-                type: caldav
-                url: "https://nextcloud.example.com/remote.php/dav/calendars/user/verein/"
-                username_env: CAL_VEREIN_USER
-                password_env: CAL_VEREIN_PASS
-        """))
-        monkeypatch.setenv("CAL_VEREIN_USER", "user")
-        monkeypatch.setenv("CAL_VEREIN_PASS", "pass")
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        accounts = config_module.load_config()
-        assert "verein" in accounts
-        assert accounts["verein"].type == "caldav"
-
-    def test_multiple_calendars(self, tmp_path, monkeypatch):
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                type: ews
-                ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
-                username_env: CAL_WORK_USER
-                password_env: CAL_WORK_PASS
-              - name: family
-                type: google
-                credentials_file: "/config/creds.json"
-              - name: verein
-                type: caldav
-                url: "https://nextcloud.example.com/dav/"
-                username_env: CAL_V_USER
-                password_env: CAL_V_PASS
-        """))
-        monkeypatch.setenv("CAL_WORK_USER", "u")
-        monkeypatch.setenv("CAL_WORK_PASS", "p")
-        monkeypatch.setenv("CAL_V_USER", "u")
-        monkeypatch.setenv("CAL_V_PASS", "p")
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        accounts = config_module.load_config()
-        assert len(accounts) == 3
+    @pytest.mark.parametrize("yaml_text,env,expected", [
+        (EWS_YAML, EWS_ENV, {"work": "ews"}),
+        (GOOGLE_YAML, None, {"family": "google"}),
+        (CALDAV_YAML, CALDAV_ENV, {"verein": "caldav"}),
+        (MULTI_YAML, MULTI_ENV, {"work": "ews", "family": "google", "verein": "caldav"}),
+    ], ids=["ews", "google", "caldav", "multiple"])
+    def test_valid_config(self, monkeypatch, yaml_text, env, expected):
+        for key, value in (env or {}).items():
+            monkeypatch.setenv(key, value)
+        accounts = config_module.load_config_from_text(yaml_text)
+        assert {name: acct.type for name, acct in accounts.items()} == expected
+
+    def test_ews_label_and_credentials(self, valid_ews_accounts):
+        work = valid_ews_accounts["work"]
+        assert work.label == "Firmenkalender"
+        assert work.credentials["_username"] == "user@example.com"
+        assert work.credentials["_password"] == "secret"
+        assert "_password" not in work.config
+        assert "secret" not in repr(work)
+
+    def test_uses_libyaml_loader_when_available(self):
+        import yaml
+        expected = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        assert config_module._Loader is expected
 
     def test_missing_config_file(self, monkeypatch):
         monkeypatch.setattr(config_module, "CONFIG_PATH", "/nonexistent/config.yaml")
         accounts = config_module.load_config()
         assert accounts == {}
 
-    def test_duplicate_name_raises(self, tmp_path, monkeypatch):
+    def test_reload_reflects_file_and_env_changes(self, tmp_path, monkeypatch):
         cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                type: ews
-                ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
-                username_env: U
-                password_env: P
-              - name: work
-                type: ews
-                ews_url: "https://exchange2.example.com/EWS/Exchange.asmx"
-                username_env: U2
-                password_env: P2
-        """))
+        cfg.write_text(EWS_YAML)
         monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        with pytest.raises(ValueError, match="Duplicate"):
-            config_module.load_config()
+        monkeypatch.setenv("CAL_WORK_USER", "user@example.com")
+        monkeypatch.setenv("CAL_WORK_PASS", "secret")
+        first = config_module.load_config()
+        assert first["work"].credentials["_password"] == "secret"
+        with pytest.raises(TypeError):
+            first["work"].config["ews_url"] = "https://other.example.com"
 
-    def test_unknown_type_raises(self, tmp_path, monkeypatch):
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: test
-                type: outlook365
-                url: "https://example.com"
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        with pytest.raises(ValueError, match="unknown type"):
-            config_module.load_config()
+        monkeypatch.setenv("CAL_WORK_PASS", "rotated")
+        assert config_module.load_config()["work"].credentials["_password"] == "rotated"
 
-    def test_ews_missing_url_raises(self, tmp_path, monkeypatch):
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                type: ews
-                username_env: U
-                password_env: P
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        with pytest.raises(ValueError, match="ews_url"):
-            config_module.load_config()
+        cfg.write_text(cfg.read_text().replace("name: work", "name: office"))
+        assert list(config_module.load_config()) == ["office"]
+
+    @pytest.mark.parametrize("yaml_text,match", [
+        (DUPLICATE_YAML, "Duplicate"),
+        (UNKNOWN_TYPE_YAML, "unknown type"),
+        (EWS_NO_URL_YAML, "ews_url"),
+    ], ids=["duplicate-name", "unknown-type", "ews-missing-url"])
+    def test_invalid_config_raises(self, yaml_text, match):
+        with pytest.raises(ValueError, match=match):
+            config_module.load_config_from_text(yaml_text)
 
 
 # ---------------------------------------------------------------------------
 # Tool tests: list_calendars
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("_reset_state")
 class TestListCalendars:
     async def test_no_calendars(self):
         result = await server.list_calendars()
         assert "error" in result
 
     async def test_with_calendars(self):
-        server._accounts = {
+        server._set_accounts({
             "work": _make_account("work", "Firmenkalender"),
             "family": _make_account("family", "Familie", "google", {"credentials_file": "/x"}),
-        }
+        })
         result = await server.list_calendars()
         assert len(result["calendars"]) == 2
         assert result["calendars"][0]["name"] == "work"
@@ -231,20 +413,20 @@ class TestListCalendars:
 # Tool tests: list_events
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("_reset_state")
 class TestListEvents:
     async def test_no_calendars(self):
-        result = await server.list_events()
-        assert result["count"] == 0
-        assert result["calendars_queried"] == []
+        result = await server.list_events(start="not a date")
+        assert "No calendars configured" in result["error"]
 
     async def test_unknown_calendar(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = await server.list_events(calendar="nonexistent")
         assert "error" in result
         assert "nonexistent" in result["error"]
 
     async def test_single_calendar(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         events = [_make_event("e1", "work", "Meeting")]
         backend = _setup_mock_backend(events)
         server._backends = {"work": backend}
@@ -255,10 +437,10 @@ class TestListEvents:
         assert result["calendars_queried"] == ["work"]
 
     async def test_all_calendars_merged(self):
-        server._accounts = {
+        server._set_accounts({
             "work": _make_account("work"),
             "family": _make_account("family"),
-        }
+        })
         work_events = [_make_event("e1", "work", "Work Meeting", datetime(2026, 2, 13, 14, 0))]
         family_events = [_make_event("e2", "family", "Zahnarzt", datetime(2026, 2, 13, 10, 0))]
 
@@ -272,19 +454,27 @@ class TestListEvents:
         assert result["events"][0]["title"] == "Zahnarzt"
         assert result["events"][1]["title"] == "Work Meeting"
 
+    async def test_calendars_queried_is_a_fresh_list(self):
+        server._set_accounts({"work": _make_account("work"), "family": _make_account("family")})
+        server._backends = {"work": _setup_mock_backend(), "family": _setup_mock_backend()}
+
+        result = await server.list_events(start="2026-02-13", end="2026-02-13")
+        result["calendars_queried"].append("intruder")
+        assert server._visible_names(None) == ("work", "family")
+
     async def test_invalid_start_date(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = await server.list_events(start="not-a-date")
         assert "error" in result
 
     async def test_backend_error_partial_results(self):
-        server._accounts = {
+        server._set_accounts({
             "work": _make_account("work"),
             "family": _make_account("family"),
-        }
+        })
         work_backend = _setup_mock_backend([_make_event("e1", "work", "Meeting")])
-        family_backend = AsyncMock()
-        family_backend.list_events = AsyncMock(side_effect=Exception("Connection failed"))
+        family_backend = _setup_mock_backend()
+        family_backend.list_events = _araise(Exception("Connection failed"))
         server._backends = {"work": work_backend, "family": family_backend}
 
         result = await server.list_events(start="2026-02-13")
@@ -292,17 +482,53 @@ class TestListEvents:
         assert len(result["errors"]) == 1  # Error from family
 
 
+class TestListAllEvents:
+    async def test_merges_sorted_lists(self):
+        work_backend = _setup_mock_backend([
+            _make_event("w1", "work", "Standup", datetime(2026, 2, 13, 9, 0)),
+            _make_event("w2", "work", "Review", datetime(2026, 2, 13, 16, 0)),
+        ])
+        family_backend = _setup_mock_backend([
+            _make_event("f1", "family", "Zahnarzt", datetime(2026, 2, 13, 11, 0)),
+        ])
+        events, errors = await list_all_events(
+            {"work": work_backend, "family": family_backend},
+            datetime(2026, 2, 13), datetime(2026, 2, 14),
+        )
+        assert [e.id for e in events] == ["w1", "f1", "w2"]
+        assert errors == {}
+
+    async def test_failure_isolated(self):
+        work_backend = _setup_mock_backend([_make_event("w1", "work", "Standup")])
+        family_backend = _setup_mock_backend()
+        family_backend.list_events = _araise(Exception("Connection failed"))
+        events, errors = await list_all_events(
+            {"work": work_backend, "family": family_backend},
+            datetime(2026, 2, 13), datetime(2026, 2, 14),
+        )
+        assert [e.id for e in events] == ["w1"]
+        assert list(errors) == ["family"]
+
+    async def test_cancellation_propagates(self):
+        work_backend = _setup_mock_backend([_make_event("w1", "work", "Standup")])
+        family_backend = _setup_mock_backend()
+        family_backend.list_events = _araise(asyncio.CancelledError())
+        with pytest.raises(asyncio.CancelledError):
+            await list_all_events(
+                {"work": work_backend, "family": family_backend},
+                datetime(2026, 2, 13), datetime(2026, 2, 14),
+            )
+
+
 # ---------------------------------------------------------------------------
 # Tool tests: create_event
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("_reset_state")
 class TestCreateEvent:
-    async def test_create_success(self):
-        server._accounts = {"work": _make_account("work")}
-        created = _make_event("new-1", "work", "New Meeting")
-        backend = _setup_mock_backend()
-        backend.create_event = AsyncMock(return_value=created)
-        server._backends = {"work": backend}
+    async def test_create_success(self, mock_backend):
+        server._set_accounts({"work": _make_account("work")})
+        server._backends = {"work": mock_backend}
 
         result = await server.create_event(
             calendar="work",
@@ -312,9 +538,10 @@ class TestCreateEvent:
         )
         assert result["success"] is True
         assert result["event"]["title"] == "New Meeting"
+        assert [e.title for e in mock_backend.events] == ["New Meeting"]
 
     async def test_create_unknown_calendar(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = await server.create_event(
             calendar="nonexistent",
             title="Test",
@@ -324,7 +551,7 @@ class TestCreateEvent:
         assert "error" in result
 
     async def test_create_invalid_dates(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = await server.create_event(
             calendar="work",
             title="Test",
@@ -338,21 +565,20 @@ class TestCreateEvent:
 # Tool tests: delete_event
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("_reset_state")
 class TestDeleteEvent:
-    async def test_delete_success(self):
-        server._accounts = {"work": _make_account("work")}
-        backend = _setup_mock_backend()
-        backend.delete_event = AsyncMock(return_value=True)
-        server._backends = {"work": backend}
+    async def test_delete_success(self, mock_backend):
+        server._set_accounts({"work": _make_account("work")})
+        mock_backend.events = [_make_event("evt-1", "work")]
+        server._backends = {"work": mock_backend}
 
         result = await server.delete_event(calendar="work", event_id="evt-1")
         assert result["success"] is True
+        assert mock_backend.events == []
 
-    async def test_delete_not_found(self):
-        server._accounts = {"work": _make_account("work")}
-        backend = _setup_mock_backend()
-        backend.delete_event = AsyncMock(return_value=False)
-        server._backends = {"work": backend}
+    async def test_delete_not_found(self, mock_backend):
+        server._set_accounts({"work": _make_account("work")})
+        server._backends = {"work": mock_backend}
 
         result = await server.delete_event(calendar="work", event_id="nonexistent")
         assert "error" in result
@@ -362,19 +588,18 @@ class TestDeleteEvent:
 # Tool tests: get_event
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("_reset_state")
 class TestGetEvent:
-    async def test_get_success(self):
-        server._accounts = {"work": _make_account("work")}
-        event = _make_event("e1", "work", "Team Meeting")
-        backend = _setup_mock_backend()
-        backend.get_event = AsyncMock(return_value=event)
-        server._backends = {"work": backend}
+    async def test_get_success(self, mock_backend):
+        server._set_accounts({"work": _make_account("work")})
+        mock_backend.events = [_make_event("e1", "work", "Team Meeting")]
+        server._backends = {"work": mock_backend}
 
         result = await server.get_event(calendar="work", event_id="e1")
         assert result["event"]["title"] == "Team Meeting"
 
     async def test_get_unknown_calendar(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = await server.get_event(calendar="nonexistent", event_id="e1")
         assert "error" in result
 
@@ -383,20 +608,19 @@ class TestGetEvent:
 # Tool tests: update_event
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("_reset_state")
 class TestUpdateEvent:
-    async def test_update_success(self):
-        server._accounts = {"work": _make_account("work")}
-        updated = _make_event("e1", "work", "Updated Meeting")
-        backend = _setup_mock_backend()
-        backend.update_event = AsyncMock(return_value=updated)
-        server._backends = {"work": backend}
+    async def test_update_success(self, mock_backend):
+        server._set_accounts({"work": _make_account("work")})
+        mock_backend.events = [_make_event("e1", "work", "Meeting")]
+        server._backends = {"work": mock_backend}
 
         result = await server.update_event(calendar="work", event_id="e1", title="Updated Meeting")
         assert result["success"] is True
         assert result["event"]["title"] == "Updated Meeting"
 
     async def test_update_no_fields(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = await server.update_event(calendar="work", event_id="e1")
         assert "error" in result
         assert "No fields" in result["error"]
@@ -415,26 +639,105 @@ class TestHelpers:
         assert d["title"] == "Test"
         assert isinstance(d["start"], str)
 
+    def test_parse_datetime(self):
+        assert server._parse_datetime("2026-02-13") == datetime(2026, 2, 13)
+        assert server._parse_datetime("2026-02-13T09:30:00") == datetime(2026, 2, 13, 9, 30)
+        # Non-ISO input falls back to dateutil
+        assert server._parse_datetime("13 Feb 2026 09:30") == datetime(2026, 2, 13, 9, 30)
+
+    def test_fake_backend_matches_protocol(self):
+        """_FakeBackend must keep the CalendarBackend method signatures so stubs catch typos."""
+        assert isinstance(_FakeBackend(), CalendarBackend)
+        for name, member in vars(CalendarBackend).items():
+            if inspect.iscoroutinefunction(member):
+                fake = getattr(_FakeBackend, name)
+                assert inspect.iscoroutinefunction(fake), name
+                assert list(inspect.signature(fake).parameters) == list(inspect.signature(member).parameters), name
+
+    async def test_fake_backend_round_trip(self):
+        backend = _FakeBackend()
+        created = await backend.create_event("Training", _DEFAULT_START, _DEFAULT_END, location="Halle 2")
+        assert await backend.get_event(created.id) == created
+        updated = await backend.update_event(created.id, title="Training (verschoben)")
+        assert updated.location == "Halle 2"
+        assert await backend.list_events(_DEFAULT_START, _DEFAULT_END) == [updated]
+        assert await backend.delete_event(created.id) is True
+        assert await backend.delete_event(created.id) is False
+        with pytest.raises(ValueError, match="not found"):
+            await backend.get_event(created.id)
+
+    def test_init_backend_passes_credentials(self, valid_ews_accounts):
+        backend = server._init_backend(valid_ews_accounts["work"])
+        assert backend._config["_username"] == "user@example.com"
+        assert backend._config["_password"] == "secret"
+        assert backend._config["ews_url"] == "https://exchange.example.com/EWS/Exchange.asmx"
+
+    @pytest.mark.usefixtures("_reset_state")
     def test_validate_calendar_no_accounts(self):
         result = server._validate_calendar("work")
         assert result is not None
         assert "error" in result
 
+    @pytest.mark.usefixtures("_reset_state")
     def test_validate_calendar_unknown(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = server._validate_calendar("nonexistent")
         assert "nonexistent" in result["error"]
 
+    @pytest.mark.usefixtures("_reset_state")
     def test_validate_calendar_valid(self):
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         result = server._validate_calendar("work")
         assert result is None
 
+    @pytest.mark.usefixtures("_reset_state")
+    async def test_accounts_loaded_on_first_use(self):
+        server._accounts = None
+        with patch.object(server, "load_config", return_value={"work": _make_account("work")}) as mock_load:
+            await server.list_calendars()
+            result = await server.list_calendars()
+        mock_load.assert_called_once()
+        assert result["calendars"][0]["name"] == "work"
+
+    @pytest.mark.usefixtures("_reset_state")
+    def test_main_exits_on_invalid_config(self, monkeypatch):
+        server._accounts = None
+        monkeypatch.setattr("sys.argv", ["renfield-mcp-calendar"])
+        with patch.object(server, "load_config", side_effect=ValueError("Duplicate calendar name: 'work'")), \
+                patch.object(server.mcp, "run") as mock_run, pytest.raises(SystemExit) as exc_info:
+            server.main()
+        assert exc_info.value.code == 1
+        mock_run.assert_not_called()
+
+    def test_main_exits_on_malformed_yaml(self, monkeypatch, tmp_path):
+        config_file = tmp_path / "calendar_accounts.yaml"
+        config_file.write_text("calendars:\n  - name: work\n    type: [ews\n")
+        server._accounts = None
+        monkeypatch.setattr(config_module, "CONFIG_PATH", str(config_file))
+        monkeypatch.setattr("sys.argv", ["renfield-mcp-calendar"])
+        with patch.object(server.mcp, "run") as mock_run, pytest.raises(SystemExit) as exc_info:
+            server.main()
+        assert exc_info.value.code == 1
+        mock_run.assert_not_called()
+
+    @pytest.mark.usefixtures("_reset_state")
+    async def test_lifespan_closes_backends(self):
+        work_backend = _setup_mock_backend()
+        family_backend = _setup_mock_backend()
+        family_backend.close_error = Exception("already closed")
+        server._backends = {"work": work_backend, "family": family_backend}
+
+        async with server._lifespan(server.mcp):
+            pass
+        assert work_backend.close_count == 1
+        assert family_backend.close_count == 1
+
 
 # ---------------------------------------------------------------------------
 # Tool tests: get_pending_notifications
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("_reset_state")
 class TestGetPendingNotifications:
     async def test_no_calendars(self):
         """No calendars configured — returns empty list."""
@@ -443,256 +746,147 @@ class TestGetPendingNotifications:
 
     async def test_no_upcoming_events(self):
         """Calendar has no events in lookahead window."""
-        server._accounts = {"work": _make_account("work")}
+        server._set_accounts({"work": _make_account("work")})
         backend = _setup_mock_backend(events=[])
         server._backends = {"work": backend}
 
         result = await server.get_pending_notifications(lookahead_minutes=45)
         assert result == []
 
-    async def test_event_at_30_minutes(self):
-        """Event starting in ~30 minutes should generate info notification."""
-        from datetime import timedelta
-
-        now = datetime.now()
-        event_start = now + timedelta(minutes=30)
-        event_end = event_start + timedelta(hours=1)
-
-        server._accounts = {"work": _make_account("work", label="Firmenkalender")}
-        event = _make_event("e1", "work", "Team Meeting", start=event_start, end=event_end)
-        backend = _setup_mock_backend(events=[event])
-        server._backends = {"work": backend}
-
-        result = await server.get_pending_notifications(lookahead_minutes=45)
-        assert len(result) == 1
-        assert result[0]["event_type"] == "calendar.reminder_upcoming"
-        assert result[0]["title"] == "Team Meeting"
-        assert "30 Minuten" in result[0]["message"]
-        assert "Firmenkalender" in result[0]["message"]
-        assert result[0]["urgency"] == "info"
-        assert result[0]["dedup_key"] == "calendar:work:e1:30min"
-        assert result[0]["data"]["calendar"] == "work"
-        assert result[0]["data"]["event_id"] == "e1"
-
-    async def test_event_at_5_minutes(self):
-        """Event starting in ~5 minutes should generate warning notification."""
-        from datetime import timedelta
-
-        now = datetime.now()
-        event_start = now + timedelta(minutes=5)
-        event_end = event_start + timedelta(hours=1)
-
-        server._accounts = {"work": _make_account("work", label="Firmenkalender")}
-        event = _make_event("e2", "work", "Standup", start=event_start, end=event_end)
-        backend = _setup_mock_backend(events=[event])
-        server._backends = {"work": backend}
+    @pytest.mark.parametrize("minutes_ahead,urgency,key_suffix", [
+        (30, "info", "30min"),
+        (5, "warning", "5min"),
+        (40, None, None),  # between thresholds: no reminder
+    ], ids=["30min-info", "5min-warning", "40min-none"])
+    async def test_reminder_thresholds(self, frozen_now, minutes_ahead, urgency, key_suffix):
+        event_start = frozen_now + timedelta(minutes=minutes_ahead)
+        server._set_accounts({"work": _make_account("work", label="Firmenkalender")})
+        event = _make_event("e1", "work", "Team Meeting", start=event_start, end=event_start + timedelta(hours=1))
+        server._backends = {"work": _setup_mock_backend(events=[event])}
 
         result = await server.get_pending_notifications(lookahead_minutes=45)
-        assert len(result) == 1
-        assert result[0]["urgency"] == "warning"
-        assert "5 Minuten" in result[0]["message"]
-        assert result[0]["dedup_key"] == "calendar:work:e2:5min"
-
-    async def test_event_too_far_away(self):
-        """Event starting in 40 minutes — no 30min or 5min threshold match."""
-        from datetime import timedelta
-
-        now = datetime.now()
-        event_start = now + timedelta(minutes=40)
-        event_end = event_start + timedelta(hours=1)
-
-        server._accounts = {"work": _make_account("work")}
-        event = _make_event("e3", "work", "Far Away", start=event_start, end=event_end)
-        backend = _setup_mock_backend(events=[event])
-        server._backends = {"work": backend}
-
-        result = await server.get_pending_notifications(lookahead_minutes=45)
-        assert result == []
-
-    async def test_multiple_calendars(self):
+        if urgency is None:
+            assert result == []
+            return
+        [notification] = result
+        assert notification["event_type"] == "calendar.reminder_upcoming"
+        assert notification["title"] == "Team Meeting"
+        assert f"{minutes_ahead} Minuten" in notification["message"]
+        assert "Firmenkalender" in notification["message"]
+        assert notification["urgency"] == urgency
+        assert notification["dedup_key"] == f"calendar:work:e1:{key_suffix}"
+        assert notification["data"]["calendar"] == "work"
+        assert notification["data"]["event_id"] == "e1"
+        assert notification["tts"] is True
+
+    async def test_multiple_calendars(self, frozen_now, installed_two_calendars):
         """Events from multiple calendars should be included."""
-        from datetime import timedelta
-
-        now = datetime.now()
-        event1_start = now + timedelta(minutes=30)
-        event2_start = now + timedelta(minutes=5)
-
-        server._accounts = {
-            "work": _make_account("work", label="Firmenkalender"),
-            "family": _make_account("family", label="Familienkalender", cal_type="google", config={
-                "calendar_id": "primary",
-                "credentials_file": "/tmp/creds.json",
-                "token_file": "/tmp/token.json",
-            }),
-        }
-        event1 = _make_event("e1", "work", "Meeting", start=event1_start, end=event1_start + timedelta(hours=1))
-        event2 = _make_event("e2", "family", "Zahnarzt", start=event2_start, end=event2_start + timedelta(hours=1))
-
-        backend1 = _setup_mock_backend(events=[event1])
-        backend2 = _setup_mock_backend(events=[event2])
-        server._backends = {"work": backend1, "family": backend2}
+        event1_start = frozen_now + timedelta(minutes=30)
+        event2_start = frozen_now + timedelta(minutes=5)
+        installed_two_calendars.work.events = [
+            _make_event("e1", "work", "Meeting", start=event1_start, end=event1_start + timedelta(hours=1)),
+        ]
+        installed_two_calendars.family.events = [
+            _make_event("e2", "family", "Zahnarzt", start=event2_start, end=event2_start + timedelta(hours=1)),
+        ]
 
         result = await server.get_pending_notifications(lookahead_minutes=45)
         assert len(result) == 2
         calendars = {r["data"]["calendar"] for r in result}
         assert calendars == {"work", "family"}
 
-    async def test_backend_failure_graceful(self):
+    async def test_backend_failure_graceful(self, frozen_now, installed_two_calendars):
         """If one backend fails, others still return notifications."""
-        from datetime import timedelta
-
-        now = datetime.now()
-        event_start = now + timedelta(minutes=30)
-
-        server._accounts = {
-            "work": _make_account("work", label="Firmenkalender"),
-            "family": _make_account("family", label="Familienkalender", cal_type="google", config={
-                "calendar_id": "primary",
-                "credentials_file": "/tmp/creds.json",
-                "token_file": "/tmp/token.json",
-            }),
-        }
-
-        good_backend = _setup_mock_backend(events=[
-            _make_event("e1", "work", "Meeting", start=event_start, end=event_start + timedelta(hours=1))
-        ])
-        bad_backend = _setup_mock_backend()
-        bad_backend.list_events = AsyncMock(side_effect=Exception("Connection failed"))
-
-        server._backends = {"work": good_backend, "family": bad_backend}
+        event_start = frozen_now + timedelta(minutes=30)
+        installed_two_calendars.work.events = [
+            _make_event("e1", "work", "Meeting", start=event_start, end=event_start + timedelta(hours=1)),
+        ]
+        installed_two_calendars.family.list_events = _araise(Exception("Connection failed"))
 
         result = await server.get_pending_notifications(lookahead_minutes=45)
         assert len(result) == 1
         assert result[0]["data"]["calendar"] == "work"
 
-    async def test_notification_has_tts_flag(self):
-        """Notifications should include tts=True for TTS delivery."""
-        from datetime import timedelta
-
-        now = datetime.now()
-        event_start = now + timedelta(minutes=30)
-
-        server._accounts = {"work": _make_account("work")}
-        event = _make_event("e1", "work", "Test", start=event_start, end=event_start + timedelta(hours=1))
-        backend = _setup_mock_backend(events=[event])
-        server._backends = {"work": backend}
-
-        result = await server.get_pending_notifications()
-        assert result[0]["tts"] is True
-
 
 # ---------------------------------------------------------------------------
 # Visibility config tests
 # ---------------------------------------------------------------------------
 
 class TestVisibilityConfig:
-    def test_default_visibility_shared(self, tmp_path, monkeypatch):
+    def test_default_visibility_shared(self, valid_google_accounts):
         """Calendar without visibility field defaults to 'shared'."""
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: family
-                type: google
-                credentials_file: "/config/creds.json"
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        accounts = config_module.load_config()
-        assert accounts["family"].visibility == "shared"
-        assert accounts["family"].owner_id is None
+        assert valid_google_accounts["family"].visibility == "shared"
+        assert valid_google_accounts["family"].owner_id is None
 
-    def test_owner_visibility_with_owner_id(self, tmp_path, monkeypatch):
+    def test_owner_visibility_with_owner_id(self, owner_accounts):
         """visibility: owner + owner_id loads correctly."""
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                type: ews
-                visibility: owner
-                owner_id: 1
-                ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
-                username_env: U
-                password_env: P
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        accounts = config_module.load_config()
-        assert accounts["work"].visibility == "owner"
-        assert accounts["work"].owner_id == 1
+        assert owner_accounts["work"].visibility == "owner"
+        assert owner_accounts["work"].owner_id == 1
 
-    def test_owner_without_owner_id_raises(self, tmp_path, monkeypatch):
+    def test_owner_without_owner_id_raises(self):
         """visibility: owner without owner_id raises ValueError."""
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                type: ews
-                visibility: owner
-                ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
-                username_env: U
-                password_env: P
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
         with pytest.raises(ValueError, match="requires 'owner_id'"):
-            config_module.load_config()
+            config_module.load_config_from_text(OWNER_NO_ID_YAML)
 
-    def test_invalid_visibility_raises(self, tmp_path, monkeypatch):
+    def test_invalid_visibility_raises(self):
         """Invalid visibility value raises ValueError."""
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                type: ews
-                visibility: private
-                ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
-                username_env: U
-                password_env: P
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
         with pytest.raises(ValueError, match="invalid visibility"):
-            config_module.load_config()
+            config_module.load_config_from_text(INVALID_VISIBILITY_YAML)
 
-    def test_visibility_fields_not_in_config_dict(self, tmp_path, monkeypatch):
+    def test_visibility_fields_not_in_config_dict(self, owner_accounts):
         """visibility and owner_id should not leak into the config dict."""
-        cfg = tmp_path / "cal.yaml"
-        cfg.write_text(textwrap.dedent("""\
-            calendars:
-              - name: work
-                type: ews
-                visibility: owner
-                owner_id: 1
-                ews_url: "https://exchange.example.com/EWS/Exchange.asmx"
-                username_env: U
-                password_env: P
-        """))
-        monkeypatch.setattr(config_module, "CONFIG_PATH", str(cfg))
-        accounts = config_module.load_config()
-        assert "visibility" not in accounts["work"].config
-        assert "owner_id" not in accounts["work"].config
+        assert "visibility" not in owner_accounts["work"].config
+        assert "owner_id" not in owner_accounts["work"].config
 
 
 # ---------------------------------------------------------------------------
 # Visibility filtering tests
 # ---------------------------------------------------------------------------
 
-class TestVisibilityFiltering:
-    """Tests for user_id-based visibility filtering across all tools."""
+_DENIED_PREFIX = "Access denied"
+
+
+def _assert_denied(result: dict) -> None:
+    err = result.get("error", "")
+    assert err.startswith(_DENIED_PREFIX), result
 
-    def _setup_two_calendars(self):
-        """Set up work (owner, user 1) and family (shared) calendars."""
-        server._accounts = {
+
+@pytest.fixture(scope="class")
+def two_calendars():
+    """work (owner, user 1) and family (shared) with one fake backend each; built once per class."""
+    return SimpleNamespace(
+        accounts={
             "work": _make_account("work", "Firmenkalender", visibility="owner", owner_id=1),
             "family": _make_account("family", "Familienkalender", cal_type="google",
                                     config={"credentials_file": "/x"}, visibility="shared"),
-        }
+        },
+        work=_FakeBackend(),
+        family=_FakeBackend(),
+    )
+
+
+@pytest.fixture
+def installed_two_calendars(two_calendars):
+    """Reset the two_calendars backends and install them as the server state."""
+    two_calendars.work.reset()
+    two_calendars.family.reset()
+    server._set_accounts(two_calendars.accounts)
+    server._backends = {"work": two_calendars.work, "family": two_calendars.family}
+    return two_calendars
+
+
+# installed_two_calendars replaces all server state, so _reset_state is not needed here
+@pytest.mark.usefixtures("installed_two_calendars")
+class TestVisibilityFiltering:
+    """Tests for user_id-based visibility filtering across all tools."""
 
     async def test_list_calendars_nouser_id_sees_all(self):
         """user_id=None sees all calendars (backward-compat)."""
-        self._setup_two_calendars()
         result = await server.list_calendars()
         assert len(result["calendars"]) == 2
 
     async def test_list_calendars_owner_sees_own_and_shared(self):
         """user_id=1 (owner) sees both work and family."""
-        self._setup_two_calendars()
         result = await server.list_calendars(user_id=1)
         names = [c["name"] for c in result["calendars"]]
         assert "work" in names
@@ -700,18 +894,15 @@ class TestVisibilityFiltering:
 
     async def test_list_calendars_other_user_sees_only_shared(self):
         """user_id=2 sees only shared calendars."""
-        self._setup_two_calendars()
         result = await server.list_calendars(user_id=2)
         names = [c["name"] for c in result["calendars"]]
         assert "family" in names
         assert "work" not in names
 
-    async def test_list_events_all_calendars_filters_by_visibility(self):
+    async def test_list_events_all_calendars_filters_by_visibility(self, two_calendars):
         """list_events(calendar='', user_id=2) merges only visible calendars."""
-        self._setup_two_calendars()
-        work_backend = _setup_mock_backend([_make_event("e1", "work", "Work Meeting")])
-        family_backend = _setup_mock_backend([_make_event("e2", "family", "Zahnarzt")])
-        server._backends = {"work": work_backend, "family": family_backend}
+        two_calendars.work.events = [_make_event("e1", "work", "Work Meeting")]
+        two_calendars.family.events = [_make_event("e2", "family", "Zahnarzt")]
 
         result = await server.list_events(start="2026-02-13", user_id=2)
         assert result["count"] == 1
@@ -720,101 +911,74 @@ class TestVisibilityFiltering:
 
     async def test_list_events_specific_owner_calendar_denied(self):
         """list_events(calendar='work', user_id=2) returns access denied."""
-        self._setup_two_calendars()
         result = await server.list_events(calendar="work", start="2026-02-13", user_id=2)
-        assert "error" in result
-        assert "Access denied" in result["error"]
+        _assert_denied(result)
 
-    async def test_list_events_specific_owner_calendar_allowed_for_owner(self):
+    async def test_list_events_specific_owner_calendar_allowed_for_owner(self, two_calendars):
         """list_events(calendar='work', user_id=1) works for owner."""
-        self._setup_two_calendars()
-        backend = _setup_mock_backend([_make_event("e1", "work", "Meeting")])
-        server._backends = {"work": backend}
+        two_calendars.work.events = [_make_event("e1", "work", "Meeting")]
 
         result = await server.list_events(calendar="work", start="2026-02-13", user_id=1)
         assert result["count"] == 1
 
     async def test_create_event_access_denied(self):
         """create_event on owner calendar denied for non-owner."""
-        self._setup_two_calendars()
         result = await server.create_event(
             calendar="work", title="Test", start="2026-02-14T14:00:00",
             end="2026-02-14T15:00:00", user_id=2,
         )
-        assert "error" in result
-        assert "Access denied" in result["error"]
+        _assert_denied(result)
 
-    async def test_create_event_allowed_for_owner(self):
+    async def test_create_event_allowed_for_owner(self, two_calendars):
         """create_event on owner calendar allowed for owner."""
-        self._setup_two_calendars()
-        created = _make_event("new-1", "work", "Meeting")
-        backend = _setup_mock_backend()
-        backend.create_event = AsyncMock(return_value=created)
-        server._backends = {"work": backend}
-
         result = await server.create_event(
             calendar="work", title="Meeting", start="2026-02-14T14:00:00",
             end="2026-02-14T15:00:00", user_id=1,
         )
         assert result["success"] is True
+        assert [e.title for e in two_calendars.work.events] == ["Meeting"]
 
     async def test_get_event_access_denied(self):
         """get_event on owner calendar denied for non-owner."""
-        self._setup_two_calendars()
         result = await server.get_event(calendar="work", event_id="e1", user_id=2)
-        assert "error" in result
-        assert "Access denied" in result["error"]
+        _assert_denied(result)
 
     async def test_delete_event_access_denied(self):
         """delete_event on owner calendar denied for non-owner."""
-        self._setup_two_calendars()
         result = await server.delete_event(calendar="work", event_id="e1", user_id=2)
-        assert "error" in result
-        assert "Access denied" in result["error"]
+        _assert_denied(result)
 
     async def test_update_event_access_denied(self):
         """update_event on owner calendar denied for non-owner."""
-        self._setup_two_calendars()
         result = await server.update_event(
             calendar="work", event_id="e1", title="New Title", user_id=2,
         )
-        assert "error" in result
-        assert "Access denied" in result["error"]
+        _assert_denied(result)
 
-    async def test_notifications_filters_by_visibility(self):
+    async def test_notifications_filters_by_visibility(self, frozen_now, two_calendars):
         """get_pending_notifications(user_id=2) skips owner calendars."""
-        from datetime import timedelta
-
-        self._setup_two_calendars()
-        now = datetime.now()
-        event_start = now + timedelta(minutes=30)
+        event_start = frozen_now + timedelta(minutes=30)
 
         work_event = _make_event("e1", "work", "Work Meeting", start=event_start, end=event_start + timedelta(hours=1))
         family_event = _make_event("e2", "family", "Zahnarzt", start=event_start, end=event_start + timedelta(hours=1))
 
-        work_backend = _setup_mock_backend(events=[work_event])
-        family_backend = _setup_mock_backend(events=[family_event])
-        server._backends = {"work": work_backend, "family": family_backend}
+        two_calendars.work.events = [work_event]
+        two_calendars.family.events = [family_event]
 
         result = await server.get_pending_notifications(user_id=2)
         calendars = {r["data"]["calendar"] for r in result}
         assert "family" in calendars
         assert "work" not in calendars
 
-    async def test_notifications_nouser_id_sees_all(self):
+    async def test_notifications_nouser_id_sees_all(self, frozen_now, two_calendars):
         """get_pending_notifications() (no user_id, poller) sees all calendars."""
-        from datetime import timedelta
-
-        self._setup_two_calendars()
-        now = datetime.now()
-        event_start = now + timedelta(minutes=30)
+        event_start = frozen_now + timedelta(minutes=30)
 
         work_event = _make_event("e1", "work", "Work Meeting", start=event_start, end=event_start + timedelta(hours=1))
         family_event = _make_event("e2", "family", "Zahnarzt", start=event_start, end=event_start + timedelta(hours=1))
 
-        work_backend = _setup_mock_backend(events=[work_event])
-        family_backend = _setup_mock_backend(events=[family_event])
-        server._backends = {"work": work_backend, "family": family_backend}
+        two_calendars.work.events = [work_event]
+        two_calendars.family.events = [family_event]
 
         result = await server.get_pending_notifications()
         calendars = {r["data"]["calendar"] for r in result}
@@ -822,9 +986,9 @@ class TestVisibilityFiltering:
 
     async def test_shared_calendar_visible_to_any_user(self):
         """A shared calendar is visible to any authenticated user."""
-        server._accounts = {
+        server._set_accounts({
             "family": _make_account("family", "Familienkalender", visibility="shared"),
-        }
+        })
         result = await server.list_calendars(user_id=999)
         assert len(result["calendars"]) == 1
         assert result["calendars"][0]["name"] == "family"